@@ -6,12 +6,16 @@ Turkce font destekli, gorsel bütünlüğü koruyan
 """
 
 import io
+import logging
 import os
 import sys
 import traceback
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 
+# Logger tabanlı modüller (translators) için tek noktadan seviye ayarı
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"))
+
 # Modülleri import et
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -39,6 +43,11 @@ from converters.pdf_to_image import PDFToImageConverter, PDFPreviewGenerator
 # Translators - Multi provider (HF, MyMemory, Libre)
 from translators.multi_translator import get_translator
 
+# Çeviri ısıtması burada DEĞİL gunicorn post_fork'ta yapılır:
+# preload_app=True ile import master'da koşar ve ısıtmanın açtığı
+# SQLite bağlantısı + TLS soketleri fork'la her worker'a mirasa
+# geçerdi (bkz. gunicorn_conf.post_fork)
+
 # Flask uygulaması
 app = Flask(__name__)
 
@@ -658,7 +667,8 @@ def ext_pdf_ocr():
         print(f"🔍 PDF OCR: {file.filename}, Dil: {lang}")
 
         ocr_service = TurkishOCRService()
-        result = ocr_service.ocr_pdf(pdf_bytes, lang)
+        # API güven değerini döndürüyor: confidence hesaplaması açık
+        result = ocr_service.ocr_pdf(pdf_bytes, lang, with_confidence=True)
 
         return jsonify({
             'text': result.text,
@@ -923,6 +933,12 @@ def ext_translate_fallback():
 # ============================================================================
 
 if __name__ == '__main__':
+    # Doğrudan çalıştırmada (gunicorn yok) ısıtma burada tetiklenir;
+    # tek süreç olduğu için fork mirası sorunu yoktur
+    if os.environ.get("TRANSLATOR_WARMUP", "1") != "0":
+        from translators.hf_translator import warm_up
+        warm_up()
+
     print("\n🚀 Sunucu başlatılıyor...")
     print("📡 http://localhost:5000")
     print("\n📋 Kullanılabilir Endpoint'ler:")
@@ -8,8 +8,10 @@ Toplu dosya çevirisi servisi
 
 import io
 import os
+import re
 import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -20,6 +22,15 @@ from .translation_proxy import LibreTranslateProxy
 from .google_trans_scraper import GoogleTranslateScraper
 
 
+# Çeviriye değmeyen bloklar: sadece boşluk/rakam/noktalama (sayfa numarası vb.)
+_TRANSLATE_SKIP_RE = re.compile(r"^[\s\d\W]*$", re.UNICODE)
+
+
+def _is_translatable(text: str) -> bool:
+    """Metin bir çeviri isteğine değer mi (RTT israfını önler)"""
+    return bool(text) and len(text) >= 3 and not _TRANSLATE_SKIP_RE.match(text)
+
+
 @dataclass
 class BatchTranslationResult:
     """Toplu çeviri sonucu"""
@@ -57,6 +68,14 @@ class BatchTranslator:
         self.output_format = self.config.get("output_format", "zip")
         self.concurrent = self.config.get("concurrent", 3)
 
+        # Dil kodlarını bir kez normalize et (binlerce blok çağrısında tekrarlamamak için)
+        self.target_lang = GoogleTranslateScraper.LANG_CODES.get(
+            self.target_lang.lower(), self.target_lang
+        )
+        self.source_lang = GoogleTranslateScraper.LANG_CODES.get(
+            self.source_lang.lower(), self.source_lang
+        )
+
         # Çeviri servisi başlat
         if self.service == "libretranslate":
             self.translator = LibreTranslateProxy(self.config)
@@ -115,55 +134,103 @@ class BatchTranslator:
         )
 
     def _translate_pdf(self, pdf_bytes: bytes, source_lang: str, target_lang: str) -> bytes:
-        """PDF'i çevir (basit yaklaşım)"""
+        """PDF'i çevir (sayfa başına paralel çeviri)"""
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         output_doc = fitz.open()
 
+        # 1. geçiş: tüm sayfaların metin bloklarını topla
+        # (MuPDF aynı doküman için thread-safe değil, okuma ana thread'de)
+        page_sizes = []
+        page_texts = []
+        page_rects = []
+
         for page_num in range(len(doc)):
             page = doc[page_num]
-
-            # Yeni sayfa oluştur
-            new_page = output_doc.new_page(
-                width=page.rect.width,
-                height=page.rect.height
-            )
-
-            # Metin bloklarını çevir
-            blocks = page.get_text("dict")["blocks"]
-
-            for block in blocks:
-                if block["type"] == 0:  # Text
-                    # Metni çıkar
-                    text = ""
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            text += span["text"] + " "
-                        text += "\n"
-
-                    if text.strip():
-                        # Çeviri yap
-                        result = self.translator.translate(text.strip(), target_lang, source_lang)
-
-                        # Çevrili metni yaz
-                        block_rect = fitz.Rect(block["bbox"])
-                        new_page.draw_rect(block_rect, color=(1,1,1), fill=(1,1,1))
-
-                        # Türkçe karakter düzeltme (basit)
-                        translated = result.text
-                        if hasattr(result, "text"):
-                            translated = self._fix_turkish_chars(translated)
-
-                        new_page.insert_textbox(
-                            block_rect,
-                            translated,
-                            fontsize=10,
-                            fontname="helv",
-                            align=fitz.TEXT_ALIGN_LEFT
-                        )
+            page_sizes.append((page.rect.width, page.rect.height))
+
+            texts, bboxes = self._collect_blocks(page.get_text("dict"))
+            page_texts.append(texts)
+            page_rects.append([fitz.Rect(bbox) for bbox in bboxes])
+
+        # 2. geçiş: çevirileri thread havuzunda paralel yap
+        # (HTTP istekleri GIL'i bırakır, sayfa başına bir görev)
+        with ThreadPoolExecutor(max_workers=self.concurrent) as executor:
+            futures = [
+                executor.submit(self._translate_one_page_texts, texts, target_lang, source_lang)
+                for texts in page_texts
+            ]
+            translated_pages = [f.result() for f in futures]
+
+        # 3. geçiş: sonuçları sırayla PyMuPDF'e yaz (ana thread)
+        for (width, height), rects, translated_texts in zip(page_sizes, page_rects, translated_pages):
+            new_page = output_doc.new_page(width=width, height=height)
+
+            for block_rect, translated in zip(rects, translated_texts):
+                new_page.draw_rect(block_rect, color=(1,1,1), fill=(1,1,1))
+                new_page.insert_textbox(
+                    block_rect,
+                    translated,
+                    fontsize=10,
+                    fontname="helv",
+                    align=fitz.TEXT_ALIGN_LEFT
+                )
 
         doc.close()
         return output_doc.tobytes()
 
+    @staticmethod
+    def _collect_blocks(page_dict: Dict) -> Tuple[List[str], List[Tuple]]:
+        """
+        Sayfa dict'inden metin ve bbox listelerini tek geçişte topla
+
+        Eleman başına işi sıkı bir döngüde tutar (yerel bağlı append,
+        join ile birleştirme); fitz.Rect dönüşümü çağıran tarafta tek
+        süpürüşte yapılır.
+        """
+        texts = []
+        bboxes = []
+        texts_append = texts.append
+        bboxes_append = bboxes.append
+
+        for block in page_dict["blocks"]:
+            if block["type"] != 0:  # Text değil
+                continue
+
+            parts = []
+            parts_append = parts.append
+            for line in block.get("lines", ()):
+                for span in line.get("spans", ()):
+                    parts_append(span["text"])
+                    parts_append(" ")
+                parts_append("\n")
+
+            text = "".join(parts).strip()
+            if text:
+                texts_append(text)
+                bboxes_append(block["bbox"])
+
+        return texts, bboxes
+
+    def _translate_one_page_texts(self, texts: List[str], target_lang: str,
+                                  source_lang: str) -> List[str]:
+        """Tek sayfanın metinlerini çevir (thread havuzunda çalışır)"""
+        translated_texts = []
+
+        for text in texts:
+            # Sayfa numarası, madde imi gibi bloklar için RTT harcama
+            if not _is_translatable(text):
+                translated_texts.append(text)
+                continue
+
+            result = self.translator.translate(text, target_lang, source_lang)
+
+            # Türkçe karakter düzeltme (basit)
+            translated = result.text if hasattr(result, "text") else text
+            translated = self._fix_turkish_chars(translated)
+            translated_texts.append(translated)
+
+        return translated_texts
+
     def _fix_turkish_chars(self, text: str) -> str:
         """Türkçe karakterleri düzelt"""
         return text  # Daha detaylı düzeltme eklenebilir
@@ -185,8 +252,12 @@ class BatchTranslator:
             file_bytes = file_info.get("bytes", b"")
 
             try:
-                # Metni çöz
-                text = file_bytes.decode("utf-8")
+                # Metni çöz (bytes.isascii SIMD hızlandırmalı C döngüsüdür;
+                # saf ASCII dosyalar UTF-8 devam baytı doğrulamasını atlar)
+                if file_bytes.isascii():
+                    text = file_bytes.decode("ascii")
+                else:
+                    text = file_bytes.decode("utf-8")
 
                 # Çeviri yap
                 result = self.translator.translate(text, self.target_lang, self.source_lang)
@@ -196,10 +267,13 @@ class BatchTranslator:
                 ext = os.path.splitext(file_name)[1]
                 new_name = file_name.replace(ext, f"_{self.target_lang}{ext}")
 
+                # Çıktı tarafında da ASCII hızlı yolu kullan
+                encoding = "ascii" if translated.isascii() else "utf-8"
+
                 results.append({
                     "original_name": file_name,
                     "translated_name": new_name,
-                    "bytes": translated.encode("utf-8"),
+                    "bytes": translated.encode(encoding),
                     "success": True,
                     "error": ""
                 })
@@ -242,14 +316,16 @@ class BatchTranslator:
         else:
             result = self.translate_text_files(files)
 
-        # ZIP oluştur
-        output = io.BytesIO()
+        # ZIP oluştur (SpooledTemporaryFile: küçük arşivler bellekte kalır,
+        # büyükler diske taşar — BytesIO.getvalue()'nun çift kopyası olmaz)
+        with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as output:
+            with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                for file_result in result.files:
+                    zip_file.writestr(file_result["translated_name"], file_result["bytes"])
 
-        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for file_result in result.files:
-                zip_file.writestr(file_result["translated_name"], file_result["bytes"])
+            output.seek(0)
+            zip_bytes = output.read()
 
-        zip_bytes = output.getvalue()
         zip_name = f"translated_{self.target_lang}.zip"
 
         return zip_bytes, zip_name
@@ -9,6 +9,7 @@ Mevcut sisteme DOKUNMADAN çalışır
 import json
 import random
 import time
+from functools import lru_cache
 from typing import Dict, List, Optional
 from urllib.parse import quote
 from dataclasses import dataclass
@@ -20,6 +21,27 @@ try:
 except ImportError:
     _SCRAPER_AVAILABLE = False
 
+# orjson varsa hızlı JSON parse (bytes üzerinde, str decode olmadan)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# aiohttp varsa asenkron scraper kullanılabilir
+try:
+    import asyncio
+    import aiohttp
+    _ASYNC_AVAILABLE = True
+except ImportError:
+    _ASYNC_AVAILABLE = False
+
+
+@lru_cache(maxsize=128)
+def _normalize_lang(code: str) -> str:
+    """Dil kodunu normalize et (sonuç cache'lenir, her çağrıda lookup yapılmaz)"""
+    return GoogleTranslateScraper.LANG_CODES.get(code.lower(), code)
+
 
 @dataclass
 class ScrapedTranslation:
@@ -92,6 +114,11 @@ class GoogleTranslateScraper:
         self.delay = self.config.get("delay", 1.0)
         self.session = requests.Session()
 
+        # Sabit istek parçalarını bir kez oluştur (her çağrıda yeni dict üretmemek için)
+        self._const_params = {"client": "gtx", "dt": "t"}
+        self._headers = self._get_headers()
+        self._ua_counter = 0
+
     def _get_headers(self) -> Dict:
         """Rastgele User-Agent ile headers oluştur"""
         return {
@@ -102,6 +129,13 @@ class GoogleTranslateScraper:
             "Connection": "keep-alive",
         }
 
+    def _request_headers(self) -> Dict:
+        """Cache'li headers döndür; User-Agent her 32 istekte bir döner"""
+        self._ua_counter += 1
+        if self._ua_counter % 32 == 0:
+            self._headers["User-Agent"] = random.choice(self.USER_AGENTS)
+        return self._headers
+
     def translate(self, text: str, target_lang: str = "tr",
                  source_lang: str = "auto") -> ScrapedTranslation:
         """
@@ -123,33 +157,35 @@ class GoogleTranslateScraper:
             )
 
         # Dil kodlarını normalize et
-        target = self.LANG_CODES.get(target_lang.lower(), target_lang)
-        source = self.LANG_CODES.get(source_lang.lower(), source_lang)
+        target = _normalize_lang(target_lang)
+        source = _normalize_lang(source_lang)
+
+        # Kaynak ve hedef aynıysa HTTP turu gereksiz
+        if source != "auto" and source == target:
+            return ScrapedTranslation(
+                text=text,
+                source_lang=source,
+                target_lang=target
+            )
 
         try:
             # Rate limiting önlemi
             time.sleep(self.delay)
 
-            # Parametreler
-            params = {
-                "client": "gtx",
-                "sl": source,
-                "tl": target,
-                "dt": "t",
-                "q": text
-            }
+            # Parametreler (sabit kısım cache'den, PEP 584 merge C seviyesinde)
+            params = self._const_params | {"sl": source, "tl": target, "q": text}
 
             # İstek gönder
             response = self.get(
                 self.BASE_URL,
                 params=params,
-                headers=self._get_headers(),
+                headers=self._request_headers(),
                 timeout=self.timeout
             )
 
             if response.status_code == 200:
                 # JSON yanıtı parse et
-                data = response.json()
+                data = _loads(response.content)
 
                 # Çevrilen metni çıkar
                 if data and len(data) > 0:
@@ -204,29 +240,31 @@ class GoogleTranslateScraper:
                 target_lang=target_lang
             )
 
-        target = self.LANG_CODES.get(target_lang.lower(), target_lang)
-        source = self.LANG_CODES.get(source_lang.lower(), source_lang)
+        target = _normalize_lang(target_lang)
+        source = _normalize_lang(source_lang)
+
+        # Kaynak ve hedef aynıysa HTTP turu gereksiz
+        if source != "auto" and source == target:
+            return ScrapedTranslation(
+                text=text,
+                source_lang=source,
+                target_lang=target
+            )
 
         try:
             time.sleep(self.delay)
 
-            params = {
-                "client": "gtx",
-                "sl": source,
-                "tl": target,
-                "dt": "t",
-                "q": text
-            }
+            params = self._const_params | {"sl": source, "tl": target, "q": text}
 
             response = self.get(
                 self.FALLBACK_URL,
                 params=params,
-                headers=self._get_headers(),
+                headers=self._request_headers(),
                 timeout=self.timeout
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
 
                 if data and len(data) > 0:
                     translated = ""
@@ -249,10 +287,18 @@ class GoogleTranslateScraper:
             target_lang=target
         )
 
+    # Toplu istek sınırları (istek başına)
+    BATCH_MAX_TEXTS = 30
+    BATCH_MAX_CHARS = 5000
+
     def translate_batch(self, texts: List[str], target_lang: str = "tr",
                        source_lang: str = "auto") -> List[ScrapedTranslation]:
         """
-        Toplu metin çevirisi (rate limiting ile)
+        Toplu metin çevirisi (çoklu q parametresi ile tek HTTP isteği)
+
+        N metin = N istek yerine, metinler ~BATCH_MAX_CHARS karakterlik
+        gruplara bölünür ve her grup tek istekle çevrilir. Grup isteği
+        başarısız olursa tekli çeviriye geri dönülür.
 
         Args:
             texts: Metin listesi
@@ -262,14 +308,102 @@ class GoogleTranslateScraper:
         Returns:
             List[ScrapedTranslation]: Çeviri sonuçları
         """
+        target = _normalize_lang(target_lang)
+        source = _normalize_lang(source_lang)
+
         results = []
 
+        for chunk in self._chunk_texts(texts):
+            try:
+                results.extend(self._translate_chunk(chunk, target, source))
+            except Exception as e:
+                print(f"Toplu çeviri hatası, tekli çeviriye dönülüyor: {e}")
+                for text in chunk:
+                    results.append(self.translate(text, target, source))
+
+        return results
+
+    def _chunk_texts(self, texts: List[str]):
+        """Metinleri istek sınırlarına göre gruplara böl"""
+        chunk = []
+        chunk_len = 0
+
         for text in texts:
-            result = self.translate(text, target_lang, source_lang)
-            results.append(result)
+            if chunk and (chunk_len + len(text) > self.BATCH_MAX_CHARS
+                          or len(chunk) >= self.BATCH_MAX_TEXTS):
+                yield chunk
+                chunk = []
+                chunk_len = 0
+            chunk.append(text)
+            chunk_len += len(text)
+
+        if chunk:
+            yield chunk
+
+    def _translate_chunk(self, chunk: List[str], target: str,
+                        source: str) -> List[ScrapedTranslation]:
+        """Bir grubu tek HTTP isteğiyle çevir"""
+        time.sleep(self.delay)
+
+        # Her metin ayrı bir q parametresi olarak gönderilir
+        params = [("client", "gtx"), ("sl", source), ("tl", target), ("dt", "t")]
+        params += [("q", text) for text in chunk]
+
+        response = self.get(
+            self.BASE_URL,
+            params=params,
+            headers=self._request_headers(),
+            timeout=self.timeout
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+        data = _loads(response.content)
+
+        if len(chunk) == 1:
+            # Tek q: tekli yanıt formatı
+            translated = ""
+            for item in data[0]:
+                if item and len(item) > 0:
+                    translated += item[0]
+            detected = data[2] if len(data) > 2 else source
+            return [ScrapedTranslation(
+                text=translated,
+                source_lang=detected,
+                target_lang=target
+            )]
+
+        # Çoklu q: dış dizide her q için bir alt dizi döner. Endpoint
+        # bazen tekli yanıt formatına ([segmentler, None, "en", ...])
+        # düşer; o ~9 elemanlı metadata dizisi küçük chunk'larda salt
+        # uzunluk kontrolünden geçip bozuk çıktı üretir. Bu yüzden sonuç
+        # kurulmadan ÖNCE şekil doğrulanır: eleman sayısı chunk'la eşit
+        # ve her giriş ilk elemanı segment listesi olan bir liste olmalı
+        aligned = (
+            isinstance(data, list)
+            and len(data) == len(chunk)
+            and all(
+                isinstance(entry, list) and entry
+                and isinstance(entry[0], list)
+                and all(isinstance(seg, list) for seg in entry[0])
+                for entry in data
+            )
+        )
+        if not aligned:
+            # translate_batch'teki tek tek fallback devralsın
+            raise RuntimeError("Toplu yanıt metin sayısıyla hizalı değil")
 
-            # Rate limiting için artan gecikme
-            time.sleep(self.delay * 0.5)
+        results = []
+        for entry, original in zip(data, chunk):
+            translated = "".join(
+                seg[0] for seg in entry[0] if seg and len(seg) > 0
+            )
+            results.append(ScrapedTranslation(
+                text=translated or original,
+                source_lang=source,
+                target_lang=target
+            ))
 
         return results
 
@@ -284,23 +418,17 @@ class GoogleTranslateScraper:
             Dict: {language: str, confidence: float}
         """
         try:
-            params = {
-                "client": "gtx",
-                "sl": "auto",
-                "tl": "tr",
-                "dt": "t",
-                "q": text[:100]  # İlk 100 karakter
-            }
+            params = self._const_params | {"sl": "auto", "tl": "tr", "q": text[:100]}  # İlk 100 karakter
 
             response = self.get(
                 self.BASE_URL,
                 params=params,
-                headers=self._get_headers(),
+                headers=self._request_headers(),
                 timeout=self.timeout
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 if len(data) > 2:
                     return {
                         "language": data[2],
@@ -353,6 +481,102 @@ class SafeGoogleTranslator(GoogleTranslateScraper):
         return super().translate(text, target_lang, source_lang)
 
 
+class AsyncGoogleTranslateScraper(GoogleTranslateScraper):
+    """
+    Asenkron Google Translate scraper'ı
+    Çok büyük batch'ler için tek event loop üzerinde yüzlerce eşzamanlı istek
+    Thread havuzunun yetmediği fan-out senaryoları için
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        if not _ASYNC_AVAILABLE:
+            raise ImportError("aiohttp kurulu değil. pip install aiohttp")
+
+        super().__init__(config)
+        self.concurrent = self.config.get("concurrent", 50)
+        self.connector_limit = self.config.get("connector_limit", 200)
+
+    async def translate_async(self, session, semaphore, text: str,
+                             target_lang: str = "tr",
+                             source_lang: str = "auto") -> ScrapedTranslation:
+        """Tek metni asenkron çevir (semaphore ile eşzamanlılık sınırı)"""
+        if not text or not text.strip():
+            return ScrapedTranslation(
+                text=text,
+                source_lang=source_lang,
+                target_lang=target_lang
+            )
+
+        target = _normalize_lang(target_lang)
+        source = _normalize_lang(source_lang)
+
+        params = self._const_params | {"sl": source, "tl": target, "q": text}
+
+        try:
+            async with semaphore:
+                async with session.get(
+                    self.BASE_URL,
+                    params=params,
+                    headers=self._request_headers(),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                ) as response:
+                    if response.status == 200:
+                        data = _loads(await response.read())
+
+                        if data and len(data) > 0:
+                            translated = ""
+                            for item in data[0]:
+                                if item and len(item) > 0:
+                                    translated += item[0]
+
+                            detected = data[2] if len(data) > 2 else source
+
+                            return ScrapedTranslation(
+                                text=translated,
+                                source_lang=detected,
+                                target_lang=target
+                            )
+
+        except Exception as e:
+            print(f"Asenkron scraper hatası: {e}")
+
+        return ScrapedTranslation(
+            text=text,
+            source_lang=source,
+            target_lang=target
+        )
+
+    async def _translate_all_async(self, texts: List[str], target_lang: str,
+                                  source_lang: str) -> List[ScrapedTranslation]:
+        """Tüm metinleri tek event loop üzerinde çevir"""
+        semaphore = asyncio.Semaphore(self.concurrent)
+        connector = aiohttp.TCPConnector(limit=self.connector_limit)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [
+                self.translate_async(session, semaphore, text, target_lang, source_lang)
+                for text in texts
+            ]
+            return await asyncio.gather(*tasks)
+
+    def translate_batch(self, texts: List[str], target_lang: str = "tr",
+                       source_lang: str = "auto") -> List[ScrapedTranslation]:
+        """
+        Toplu metin çevirisi (asyncio.gather ile fan-out)
+
+        Args:
+            texts: Metin listesi
+            target_lang: Hedef dil
+            source_lang: Kaynak dil
+
+        Returns:
+            List[ScrapedTranslation]: Çeviri sonuçları (girdi sırasında)
+        """
+        return asyncio.run(
+            self._translate_all_async(texts, target_lang, source_lang)
+        )
+
+
 # Kolay kullanım fonksiyonları
 def google_translate(text: str, target_lang: str = "tr",
                     source_lang: str = "auto", config: Dict = None) -> str:
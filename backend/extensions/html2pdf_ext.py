@@ -8,6 +8,10 @@ HTML'i PDF'e dönüştürür
 
 import io
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from string import Template
 from typing import Dict, Optional, List
 
 try:
@@ -19,6 +23,158 @@ except ImportError:
     XHTML2PDF_AVAILABLE = False
 
 
+# Şablon iskeletleri: statik CSS her çağrıda yeniden kurulmasın diye
+# modül seviyesinde bir kez tanımlanır ($değişken yer tutucuları ile)
+_TEMPLATE_BASIC = """<!DOCTYPE html>
+<html lang="tr">
+<head>
+    <meta charset="$encoding">
+    <title>$title</title>
+    <style>
+        body {
+            font-family: 'DejaVu Sans', Arial, sans-serif;
+            margin: ${margin}in;
+            line-height: 1.6;
+        }
+        h1 {
+            color: #333;
+            border-bottom: 2px solid #667eea;
+            padding-bottom: 10px;
+        }
+        p {
+            margin-bottom: 12px;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            margin: 20px 0;
+        }
+        table th, table td {
+            border: 1px solid #ddd;
+            padding: 8px;
+            text-align: left;
+        }
+        table th {
+            background-color: #f2f2f2;
+        }
+        .page-break {
+            page-break-after: always;
+        }
+    </style>
+</head>
+<body>
+    <h1>$title</h1>
+    $content
+</body>
+</html>"""
+
+_TEMPLATE_COMBINED = """<!DOCTYPE html>
+<html lang="tr">
+<head>
+    <meta charset="UTF-8">
+    <title>Combined Document</title>
+    <style>
+        body { font-family: Arial, sans-serif; }
+        .page-break { page-break-after: always; }
+    </style>
+</head>
+<body>
+$body
+</body>
+</html>"""
+
+_TEMPLATE_HEADER_FOOTER = """<!DOCTYPE html>
+<html lang="tr">
+<head>
+    <meta charset="UTF-8">
+    <style>
+        @page {
+            size: $page_size;
+            margin: ${margin}in;
+            @top-center { content: "$header"; }
+            @bottom-center { content: "$footer"; }
+        }
+        body { font-family: Arial, sans-serif; }
+    </style>
+</head>
+<body>
+    $content
+</body>
+</html>"""
+
+_TEMPLATES = {
+    "basic": _TEMPLATE_BASIC,
+    "combined": _TEMPLATE_COMBINED,
+    "header_footer": _TEMPLATE_HEADER_FOOTER,
+}
+
+# İçindekiler şablonu: bölüm döngüsü Jinja2 bytecode'una derlenir,
+# Python seviyesinde string += döngüsü kalmaz
+_TEMPLATE_TOC = """<!DOCTYPE html>
+<html lang="tr">
+<head>
+    <meta charset="UTF-8">
+    <title>Document with TOC</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 1in; }
+        h1 { color: #333; border-bottom: 2px solid #667eea; }
+        h2 { color: #555; margin-top: 30px; }
+        .page-break { page-break-after: always; }
+        a { text-decoration: none; color: #667eea; }
+        a:hover { text-decoration: underline; }
+    </style>
+</head>
+<body>
+    <h1>İçindekiler</h1><ul>
+    {%- for section in sections %}
+    <li><a href="#section{{ loop.index0 }}">{{ section["title"] }}</a></li>
+    {%- endfor %}
+    </ul>
+    {%- for section in sections %}
+    <h2 id="section{{ loop.index0 }}">{{ section["title"] }}</h2>
+    {{ section["content"] }}
+    <div class="page-break"></div>
+    {%- endfor %}
+</body>
+</html>"""
+
+# Jinja2 Flask ile birlikte gelir; yine de opsiyonel bağımlılık gibi korunur
+try:
+    import tempfile
+
+    import jinja2
+
+    _jinja_cache_dir = os.path.join(tempfile.gettempdir(), "pdfconv_jinja")
+    os.makedirs(_jinja_cache_dir, exist_ok=True)
+
+    _JINJA_ENV = jinja2.Environment(
+        loader=jinja2.DictLoader({"toc": _TEMPLATE_TOC}),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(_jinja_cache_dir),
+        autoescape=False,  # içerik parametreleri zaten HTML parçaları
+    )
+    JINJA2_AVAILABLE = True
+except ImportError:
+    JINJA2_AVAILABLE = False
+
+
+@lru_cache(maxsize=16)
+def _compiled_skeleton(name: str, margin: float = None,
+                      encoding: str = None, page_size: str = None) -> Template:
+    """
+    Statik alanları (margin, encoding, sayfa boyutu) bir kez doldurulmuş
+    şablon döndür; çağrı başına sadece dinamik alanlar kalır
+    """
+    statics = {}
+    if margin is not None:
+        statics["margin"] = margin
+    if encoding is not None:
+        statics["encoding"] = encoding
+    if page_size is not None:
+        statics["page_size"] = page_size
+
+    return Template(Template(_TEMPLATES[name]).safe_substitute(statics))
+
+
 class HTMLToPDFConverter:
     """
     HTML'den PDF'e dönüştürücü
@@ -83,14 +239,14 @@ class HTMLToPDFConverter:
         # HTML'den PDF'e
         pisa.pisaDocument(html, context, encoding=self.encoding)
 
-        # PDF'i al
-        pdf_bytes = output.getvalue()
-        output.close()
-
-        # Dosyaya yaz
+        # Dosyaya sıfır kopya yaz (getbuffer ara bytes nesnesi üretmez)
         if output_path:
             with open(output_path, "wb") as f:
-                f.write(pdf_bytes)
+                f.write(output.getbuffer())
+
+        # Dönüş yolunda bytes bir kez üretilir
+        pdf_bytes = output.getvalue()
+        output.close()
 
         return pdf_bytes
 
@@ -107,49 +263,11 @@ class HTMLToPDFConverter:
         Returns:
             bytes: PDF bayt verisi
         """
-        # HTML şablonu
-        html_template = f"""<!DOCTYPE html>
-<html lang="tr">
-<head>
-    <meta charset="{self.encoding}">
-    <title>{title}</title>
-    <style>
-        body {{
-            font-family: 'DejaVu Sans', Arial, sans-serif;
-            margin: {self.margin}in;
-            line-height: 1.6;
-        }}
-        h1 {{
-            color: #333;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-        }}
-        p {{
-            margin-bottom: 12px;
-        }}
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            margin: 20px 0;
-        }}
-        table th, table td {{
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }}
-        table th {{
-            background-color: #f2f2f2;
-        }}
-        .page-break {{
-            page-break-after: always;
-        }}
-    </style>
-</head>
-<body>
-    <h1>{title}</h1>
-    {content}
-</body>
-</html>"""
+        # İskelet cache'den gelir, çağrı başına sadece başlık/içerik doldurulur
+        skeleton = _compiled_skeleton(
+            "basic", margin=self.margin, encoding=self.encoding
+        )
+        html_template = skeleton.substitute(title=title, content=content)
 
         return self.convert(html_template, output_path)
 
@@ -164,12 +282,21 @@ class HTMLToPDFConverter:
         Returns:
             bytes: PDF bayt verisi
         """
+        import shutil
+
         import requests
 
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            html = response.text.decode(self.encoding)
+            # Gövdeyi bytes olarak akışla oku; str kopyası tek sefer,
+            # decode hatalarında replace ile devam edilir
+            with requests.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True  # gzip'i şeffaf aç
+
+                buf = io.BytesIO()
+                shutil.copyfileobj(response.raw, buf)
+
+            html = buf.getvalue().decode(self.encoding, errors="replace")
             return self.convert(html, output_path)
         except Exception as e:
             raise ValueError(f"URL'den HTML alınamadı: {e}")
@@ -179,6 +306,9 @@ class HTMLToPDFConverter:
         """
         Birden fazla HTML'i tek PDF'e dönüştür
 
+        Her HTML ayrı process'te render edilir (xhtml2pdf CPU-bound),
+        sonuçlar PyMuPDF ile tek PDF'te birleştirilir.
+
         Args:
             html_list: HTML içerikleri listesi
             output_path: Çıktı dosya yolu
@@ -186,30 +316,35 @@ class HTMLToPDFConverter:
         Returns:
             bytes: PDF bayt verisi
         """
-        # Tüm HTML'leri birleştir
-        combined_html = []
+        # Tek öğe için process havuzu kurmaya değmez
+        if len(html_list) == 1:
+            return self.convert(html_list[0], output_path)
 
-        for i, html in enumerate(html_list):
-            if i > 0:
-                combined_html.append('<div class="page-break"></div>')
-            combined_html.append(html)
+        import fitz  # PyMuPDF (birleştirme için)
 
-        full_html = """<!DOCTYPE html>
-<html lang="tr">
-<head>
-    <meta charset="UTF-8">
-    <title>Combined Document</title>
-    <style>
-        body { font-family: Arial, sans-serif; }
-        .page-break { page-break-after: always; }
-    </style>
-</head>
-<body>
-""" + "\n".join(combined_html) + """
-</body>
-</html>"""
+        max_workers = min(len(html_list), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pdf_parts = list(executor.map(_render_one, html_list, repeat(self.config)))
 
-        return self.convert(full_html, output_path)
+        # Parçaları sırayla tek PDF'te topla
+        merged = fitz.open()
+        for part in pdf_parts:
+            with fitz.open(stream=part, filetype="pdf") as sub:
+                merged.insert_pdf(sub)
+
+        pdf_bytes = merged.tobytes()
+        merged.close()
+
+        if output_path:
+            with open(output_path, "wb") as f:
+                f.write(pdf_bytes)
+
+        return pdf_bytes
+
+
+def _render_one(html: str, config: Dict) -> bytes:
+    """Tek HTML'i PDF'e render et (process havuzunda çalışır, picklable)"""
+    return HTMLToPDFConverter(config).convert(html)
 
 
 class AdvancedHTMLToPDFConverter(HTMLToPDFConverter):
@@ -235,24 +370,10 @@ class AdvancedHTMLToPDFConverter(HTMLToPDFConverter):
         Returns:
             bytes: PDF bayt verisi
         """
-        html = f"""<!DOCTYPE html>
-<html lang="tr">
-<head>
-    <meta charset="UTF-8">
-    <style>
-        @page {{
-            size: {self.page_size};
-            margin: {self.margin}in;
-            @top-center {{ content: "{header}"; }}
-            @bottom-center {{ content: "{footer}"; }}
-        }}
-        body {{ font-family: Arial, sans-serif; }}
-    </style>
-</head>
-<body>
-    {content}
-</body>
-</html>"""
+        skeleton = _compiled_skeleton(
+            "header_footer", margin=self.margin, page_size=self.page_size
+        )
+        html = skeleton.substitute(header=header, footer=footer, content=content)
 
         return self.convert(html, output_path)
 
@@ -268,13 +389,17 @@ class AdvancedHTMLToPDFConverter(HTMLToPDFConverter):
         Returns:
             bytes: PDF bayt verisi
         """
-        # İçindekiler oluştur
+        if JINJA2_AVAILABLE:
+            # Derlenmiş şablon: bölüm döngüleri Jinja2 bytecode'unda döner
+            html = _JINJA_ENV.get_template("toc").render(sections=sections)
+            return self.convert(html, output_path)
+
+        # Fallback: Jinja2 yoksa eski yol
         toc_html = "<h1>İçindekiler</h1><ul>"
         for i, section in enumerate(sections):
             toc_html += f'<li><a href="#section{i}">{section["title"]}</a></li>'
         toc_html += "</ul>"
 
-        # Bölümler
         sections_html = ""
         for i, section in enumerate(sections):
             sections_html += f'<h2 id="section{i}">{section["title"]}</h2>'
@@ -6,9 +6,12 @@ Mevcut sisteme DOKUNMADAN çalışır
 PDF'i LLM input formatına hazırlar
 """
 
+import hashlib
 import io
 import json
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, asdict
 
 import fitz  # PyMuPDF
@@ -20,8 +23,24 @@ try:
 except ImportError:
     PYMUPDF4LLM_AVAILABLE = False
 
+# orjson varsa C seviyesinde JSON serileştirme
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# numpy varsa tablo filtresi vektörel taranır (pandas ile birlikte gelir)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
-@dataclass
+
+# slots: chunk başına __dict__ taşınmaz (binlerce instance'ta ~%60 bellek),
+# frozen: chunk'lar üretimden sonra değişmez
+@dataclass(slots=True, frozen=True)
 class LLMChunk:
     """LLM için metin parçası"""
     text: str
@@ -30,7 +49,12 @@ class LLMChunk:
     metadata: Dict[str, Any]
 
 
-@dataclass
+def _bbox_list(bbox) -> List[float]:
+    """bbox'u JSON'a uygun düz listeye çevir (numpy görünümü veya liste)"""
+    return bbox.tolist() if hasattr(bbox, "tolist") else list(bbox)
+
+
+@dataclass(slots=True, frozen=True)
 class LLMDocument:
     """LLM için doküman"""
     content: str
@@ -38,6 +62,10 @@ class LLMDocument:
     metadata: Dict[str, Any]
     images: List[Dict[str, Any]]
     tables: List[Dict[str, Any]]
+    # Kaynakta ayrıştırılmış görünümler: tüketiciler chunk başına
+    # metadata["type"] filtrelemek zorunda kalmaz
+    text_chunks: List[LLMChunk] = None
+    image_chunks: List[LLMChunk] = None
 
 
 class PDFToLLMPreparator:
@@ -66,10 +94,19 @@ class PDFToLLMPreparator:
         self.include_images = self.config.get("include_images", True)
         self.include_tables = self.config.get("include_tables", True)
         self.output_format = self.config.get("output_format", "text")
+        # Span seviyesi metadata gerekiyorsa yavaş dict yolu kullanılır
+        self.detailed_spans = self.config.get("detailed_spans", False)
+        # Çok sayfalı PDF'lerde sayfa çıkarımını thread havuzunda yap
+        self.parallel_pages = self.config.get("parallel_pages", False)
+
+        # prepare() sonuçları içerik hash'i ile cache'lenir:
+        # to_markdown/to_json/to_rag_format aynı baytları tekrar işlemez
+        self.cache_size = self.config.get("cache_size", 32)
+        self._prepare_cache = OrderedDict()
 
     def prepare(self, pdf_bytes: bytes) -> LLMDocument:
         """
-        PDF'i LLM için hazırla
+        PDF'i LLM için hazırla (içerik hash'i üzerinden cache'li)
 
         Args:
             pdf_bytes: PDF bayt verisi
@@ -77,6 +114,27 @@ class PDFToLLMPreparator:
         Returns:
             LLMDocument: Hazırlanmış doküman
         """
+        digest = hashlib.blake2b(pdf_bytes, digest_size=16).digest()
+
+        cached = self._prepare_cache.get(digest)
+        if cached is not None:
+            self._prepare_cache.move_to_end(digest)
+            return cached
+
+        document = self._prepare_uncached(pdf_bytes)
+
+        self._prepare_cache[digest] = document
+        if len(self._prepare_cache) > self.cache_size:
+            self._prepare_cache.popitem(last=False)
+
+        return document
+
+    def clear_cache(self) -> None:
+        """Prepare cache'ini boşalt (uzun süre çalışan sunucular için)"""
+        self._prepare_cache.clear()
+
+    def _prepare_uncached(self, pdf_bytes: bytes) -> LLMDocument:
+        """PDF'i gerçekten işle (cache'siz iç yol)"""
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
 
         # Metadata
@@ -92,38 +150,106 @@ class PDFToLLMPreparator:
         chunks = []
         all_text = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-
-            # Metin blokları
-            blocks = page.get_text("dict")["blocks"]
-
-            for block in blocks:
-                if block["type"] == 0:  # Text
-                    chunk = self._extract_text_block(block, page_num)
-                    if chunk:
-                        chunks.append(chunk)
-                        all_text.append(chunk.text)
-
-                elif block["type"] == 1 and self.include_images:  # Image
-                    img_info = self._extract_image_block(block, page_num)
-                    if img_info:
-                        # Görsel için açıklama chunk oluştur
-                        chunks.append(LLMChunk(
-                            text=f"[Image: {img_info['name']}]",
-                            page=page_num,
-                            bbox=block["bbox"],
-                            metadata={"type": "image", "image_info": img_info}
-                        ))
+        # Ana geçişte toplanan bloklar; _extract_tables ikinci bir
+        # get_text geçişi yapmadan bunları kullanır
+        text_blocks = []
+        page_image_lists = []
+        chunk_rows = []  # hızlı yolun (text, page, bbox, metadata) satırları
+
+        if self.detailed_spans:
+            for page_num in range(len(doc)):
+                page = doc[page_num]
+
+                if self.include_images:
+                    page_image_lists.append((page_num, page.get_images()))
+
+                # Yavaş yol: span seviyesi erişim için tam dict çıkarımı
+                blocks = page.get_text("dict")["blocks"]
+
+                for block in blocks:
+                    if block["type"] == 0:  # Text
+                        chunk = self._extract_text_block(block, page_num)
+                        if chunk:
+                            chunks.append(chunk)
+                            all_text.append(chunk.text)
+                            text_blocks.append((page_num, chunk.bbox, chunk.text))
+
+                    elif block["type"] == 1 and self.include_images:  # Image
+                        img_info = self._extract_image_block(block, page_num)
+                        if img_info:
+                            # Görsel için açıklama chunk oluştur
+                            chunks.append(LLMChunk(
+                                text=f"[Image: {img_info['name']}]",
+                                page=page_num,
+                                bbox=block["bbox"],
+                                metadata={"type": "image", "image_info": img_info}
+                            ))
+        else:
+            # Hızlı yol: "blocks" metni MuPDF tarafında (C'de) birleştirir,
+            # Python'da span döngüsü kalmaz. Chunk'lar satır listesinde
+            # biriktirilir; bbox dizisi döngüden sonra tek seferde kurulur.
+            # parallel_pages açıkken sayfa çıkarımı thread havuzunda döner
+            for page_num, raw_blocks, image_list, image_infos in self._iter_page_data(doc, pdf_bytes):
+                if self.include_images:
+                    page_image_lists.append((page_num, image_list))
+
+                for x0, y0, x1, y1, text, block_no, block_type in raw_blocks:
+                    if block_type != 0:
+                        continue
+
+                    text = text.strip()
+                    if text:
+                        bbox = (x0, y0, x1, y1)
+                        chunk_rows.append((text, page_num, bbox, {"type": "text"}))
+                        all_text.append(text)
+                        text_blocks.append((page_num, bbox, text))
+
+                # Görsel bilgisi de C tarafından gelir
+                for img_info_raw in image_infos:
+                    bbox = tuple(img_info_raw["bbox"])
+                    name = f"image_p{page_num}_{int(bbox[0])}_{int(bbox[1])}"
+                    chunk_rows.append((
+                        f"[Image: {name}]",
+                        page_num,
+                        bbox,
+                        {
+                            "type": "image",
+                            "image_info": {"name": name, "bbox": list(bbox), "page": page_num}
+                        }
+                    ))
+
+        if not self.detailed_spans:
+            # Bbox'lar tek (N,4) float32 dizisinde tutulur; chunk'lar bu
+            # dizinin görünümlerini taşır (AoS yerine SoA, float boxing yok)
+            if NUMPY_AVAILABLE and chunk_rows:
+                bbox_arr = np.array([row[2] for row in chunk_rows], dtype=np.float32)
+                chunks = [
+                    LLMChunk(text=text, page=page, bbox=bbox_arr[i], metadata=meta)
+                    for i, (text, page, _bbox, meta) in enumerate(chunk_rows)
+                ]
+            else:
+                chunks = [
+                    LLMChunk(text=text, page=page, bbox=list(bbox), metadata=meta)
+                    for text, page, bbox, meta in chunk_rows
+                ]
 
         # Büyük chunk'ları böl
         final_chunks = self._split_large_chunks(chunks)
 
-        # Görseller
-        images = self._extract_images(doc) if self.include_images else []
+        # Tek geçişte tipine göre ayır (tüketiciler tekrar filtrelemesin)
+        final_text_chunks = []
+        final_image_chunks = []
+        for chunk in final_chunks:
+            if chunk.metadata.get("type") == "image":
+                final_image_chunks.append(chunk)
+            else:
+                final_text_chunks.append(chunk)
+
+        # Görseller (görsel listeleri ana geçişte toplandı)
+        images = self._extract_images(doc, page_image_lists) if self.include_images else []
 
-        # Tablolar
-        tables = self._extract_tables(doc) if self.include_tables else []
+        # Tablolar (ana geçişin blokları üzerinden, ikinci parse yok)
+        tables = self._extract_tables(text_blocks) if self.include_tables else []
 
         doc.close()
 
@@ -132,16 +258,106 @@ class PDFToLLMPreparator:
             chunks=final_chunks,
             metadata=metadata,
             images=images,
-            tables=tables
+            tables=tables,
+            text_chunks=final_text_chunks,
+            image_chunks=final_image_chunks
         )
 
+    def _iter_page_data(self, doc, pdf_bytes: bytes):
+        """
+        Sayfa başına (no, bloklar, görsel listesi, görsel bilgisi) üret
+
+        parallel_pages açıkken çıkarım thread havuzunda yapılır. Paylaşılan
+        fitz dokümanı thread-safe DEĞİLDİR; bu yüzden her worker
+        pdf_bytes'tan kendi Document'ını açar (markdown_converter'daki
+        sayfa-başına-açma deseni) ve sadece düz Python sonuçları döndürür.
+        Sonuçlar her durumda sayfa sırasında döner.
+        """
+        def _extract(pno):
+            page = doc[pno]
+            image_list = page.get_images() if self.include_images else ()
+            image_infos = page.get_image_info() if self.include_images else ()
+            return pno, page.get_text("blocks"), image_list, image_infos
+
+        def _extract_own_doc(pno):
+            local = fitz.open(stream=pdf_bytes, filetype="pdf")
+            try:
+                page = local[pno]
+                image_list = page.get_images() if self.include_images else ()
+                image_infos = page.get_image_info() if self.include_images else ()
+                return pno, page.get_text("blocks"), image_list, image_infos
+            finally:
+                local.close()
+
+        if self.parallel_pages and len(doc) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(doc))) as executor:
+                yield from executor.map(_extract_own_doc, range(len(doc)))
+        else:
+            for pno in range(len(doc)):
+                yield _extract(pno)
+
+    def _iter_chunks(self, pdf_bytes: bytes) -> Iterator[LLMChunk]:
+        """
+        Chunk'ları tembel üret (çıkarım + bölme tek geçişte)
+
+        Ara LLMDocument listeleri kurulmaz: her blok çıkarılır, gerekirse
+        bölünür ve anında yield edilir. Sadece markdown/RAG çıktısı
+        isteyen tüketiciler için tüm dokümanı bellekte tutmaz.
+        Görsel/tablo envanteri gerekiyorsa prepare() kullanılır.
+        """
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+        try:
+            for page_num, raw_blocks, _image_list, image_infos in self._iter_page_data(doc, pdf_bytes):
+                for x0, y0, x1, y1, text, block_no, block_type in raw_blocks:
+                    if block_type != 0:
+                        continue
+
+                    text = text.strip()
+                    if not text:
+                        continue
+
+                    bbox = [x0, y0, x1, y1]
+
+                    if len(text) <= self.chunk_size:
+                        yield LLMChunk(
+                            text=text,
+                            page=page_num,
+                            bbox=bbox,
+                            metadata={"type": "text"}
+                        )
+                    else:
+                        for piece in self._split_text_flat(text):
+                            yield LLMChunk(
+                                text=piece,
+                                page=page_num,
+                                bbox=bbox,
+                                metadata={"type": "text"}
+                            )
+
+                for img_info_raw in image_infos:
+                    bbox = list(img_info_raw["bbox"])
+                    name = f"image_p{page_num}_{int(bbox[0])}_{int(bbox[1])}"
+                    yield LLMChunk(
+                        text=f"[Image: {name}]",
+                        page=page_num,
+                        bbox=bbox,
+                        metadata={
+                            "type": "image",
+                            "image_info": {"name": name, "bbox": bbox, "page": page_num}
+                        }
+                    )
+        finally:
+            doc.close()
+
     def _extract_text_block(self, block: Dict, page_num: int) -> Optional[LLMChunk]:
         """Metin bloğunu çıkar"""
-        text = ""
-        for line in block.get("lines", []):
-            for span in line.get("spans", []):
-                text += span["text"]
-            text += "\n"
+        # join ile birleştirme: döngüde str += O(n^2)'ye düşebilir
+        parts = []
+        for line in block.get("lines", ()):
+            parts.extend(span["text"] for span in line.get("spans", ()))
+            parts.append("\n")
+        text = "".join(parts)
 
         if text.strip():
             return LLMChunk(
@@ -173,98 +389,149 @@ class PDFToLLMPreparator:
 
             if len(text) <= self.chunk_size:
                 result.append(chunk)
-            else:
-                # Chunk'ları böl
-                words = text.split()
-                current_chunk = []
-
-                for i, word in enumerate(words):
-                    current_chunk.append(word)
-
-                    # Chunk boyutu kontrolü
-                    chunk_text = " ".join(current_chunk)
-                    if len(chunk_text) >= self.chunk_size:
-                        result.append(LLMChunk(
-                            text=chunk_text,
-                            page=chunk.page,
-                            bbox=chunk.bbox,
-                            metadata=chunk.metadata
-                        ))
-                        current_chunk = []
-
-                        # Overlap için son kelimeleri koru
-                        if self.overlap > 0:
-                            overlap_words = words[max(0, i - self.overlap//5):i+1]
-                            current_chunk = overlap_words
-                        else:
-                            current_chunk = []
-
-                # Kalan metni ekle
-                if current_chunk:
-                    result.append(LLMChunk(
-                        text=" ".join(current_chunk),
-                        page=chunk.page,
-                        bbox=chunk.bbox,
-                        metadata=chunk.metadata
-                    ))
+                continue
+
+            for piece in self._split_text_flat(text):
+                result.append(LLMChunk(
+                    text=piece,
+                    page=chunk.page,
+                    bbox=chunk.bbox,
+                    metadata=chunk.metadata
+                ))
 
         return result
 
-    def _extract_images(self, doc) -> List[Dict]:
-        """PDF'ten görselleri çıkar"""
+    def _split_text_flat(self, text: str) -> List[str]:
+        """
+        Düz metni chunk_size sınırında kelime sınırlarından böl
+
+        Kelime listesi kurmaz: bölme noktaları C hızındaki str.rfind ile
+        düz string üzerinde bulunur, kelime başına Python döngüsü yoktur.
+        Overlap, bir sonraki parçayı kesim noktasından overlap karakter
+        geriden (kelime sınırına hizalı) başlatır.
+        """
+        pieces = []
+        n = len(text)
+        start = 0
+
+        while n - start > self.chunk_size:
+            end = start + self.chunk_size
+
+            # Kesimi kelime sınırına çek; boşluk yoksa sert kes
+            cut = text.rfind(" ", start, end + 1)
+            if cut <= start:
+                cut = end
+
+            pieces.append(text[start:cut].strip())
+
+            # Overlap başlangıcını kelime sınırına hizala
+            if self.overlap > 0 and cut - self.overlap > start:
+                space = text.rfind(" ", cut - self.overlap, cut)
+                start = space + 1 if space != -1 else cut
+            else:
+                start = cut
+
+            # Baştaki boşlukları atla
+            while start < n and text[start] == " ":
+                start += 1
+
+        if start < n:
+            tail = text[start:].strip()
+            if tail:
+                pieces.append(tail)
+
+        return pieces
+
+    def _extract_images(self, doc, page_image_lists: List) -> List[Dict]:
+        """
+        PDF'ten görselleri çıkar (görsel listeleri ana geçişten gelir)
+
+        Aynı xref birçok sayfada görünebilir (logo, arka plan); her xref
+        bir kez decode edilir, tekrarlar kayda sayfa olarak eklenir.
+        """
         images = []
+        seen_xrefs = {}  # xref -> kayıt
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            image_list = page.get_images()
-
-            for img_index, img in enumerate(image_list):
-                try:
-                    xref = img[0]
-                    base_image = doc.extract_image(xref)
-
-                    if base_image:
-                        images.append({
-                            "page": page_num,
-                            "index": img_index,
-                            "format": base_image["ext"],
-                            "size": len(base_image["image"]),
-                            "width": base_image.get("width", 0),
-                            "height": base_image.get("height", 0)
-                        })
-                except:
-                    continue
+        # Bozuk görsellerde MuPDF'in stderr gürültüsünü kes
+        try:
+            fitz.TOOLS.mupdf_display_errors(False)
+        except Exception:
+            pass
+
+        try:
+            for page_num, image_list in page_image_lists:
+                for img_index, img in enumerate(image_list):
+                    try:
+                        xref = img[0]
+
+                        record = seen_xrefs.get(xref)
+                        if record is not None:
+                            record["pages"].append(page_num)
+                            continue
+
+                        base_image = doc.extract_image(xref)
+
+                        if base_image:
+                            record = {
+                                "page": page_num,
+                                "pages": [page_num],
+                                "index": img_index,
+                                "format": base_image["ext"],
+                                "size": len(base_image["image"]),
+                                "width": base_image.get("width", 0),
+                                "height": base_image.get("height", 0)
+                            }
+                            seen_xrefs[xref] = record
+                            images.append(record)
+                    except:
+                        continue
+        finally:
+            try:
+                fitz.TOOLS.mupdf_display_errors(True)
+            except Exception:
+                pass
 
         return images
 
-    def _extract_tables(self, doc) -> List[Dict]:
-        """PDF'ten tabloları çıkar (basit yaklaşım)"""
+    def _extract_tables(self, text_blocks: List) -> List[Dict]:
+        """Ana geçişte toplanan bloklardan tabloları çıkar (basit yaklaşım)"""
+        if not text_blocks:
+            return []
+
+        # Tablo benzeri yapı filtresi: birden fazla "|" karakteri.
+        # Çok blokta numpy ile tek taramada sayılır, azında str.count yeter
+        if NUMPY_AVAILABLE and len(text_blocks) > 64:
+            pipe_counts = self._bulk_pipe_counts([t for _, _, t in text_blocks])
+        else:
+            pipe_counts = [t.count("|") for _, _, t in text_blocks]
+
         tables = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
-
-            # Tablo benzeri yapıları ara
-            for block in blocks:
-                if block["type"] == 0:  # Text
-                    text = ""
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            text += span["text"] + " "
-                        text += "\n"
-
-                    # Tablo kontrolü (birden fazla "|" karakteri)
-                    if text.count("|") >= 4:
-                        tables.append({
-                            "page": page_num,
-                            "bbox": block["bbox"],
-                            "content": text.strip(),
-                            "rows": len(text.split("\n"))
-                        })
+        for (page_num, bbox, text), pipe_count in zip(text_blocks, pipe_counts):
+            if pipe_count >= 4:
+                tables.append({
+                    "page": page_num,
+                    "bbox": _bbox_list(bbox),
+                    "content": text,
+                    "rows": len(text.split("\n"))
+                })
 
         return tables
 
+    @staticmethod
+    def _bulk_pipe_counts(texts: List[str]) -> List[int]:
+        """Tüm blokların '|' sayısını tek vektörel taramayla çıkar"""
+        encoded = [t.encode("utf-8") for t in texts]
+
+        arr = np.frombuffer(b"\x00".join(encoded), dtype=np.uint8)
+
+        # Blok başlangıç offset'leri (ayraç baytları dahil)
+        starts = np.zeros(len(encoded), dtype=np.int64)
+        if len(encoded) > 1:
+            np.cumsum([len(e) + 1 for e in encoded[:-1]], out=starts[1:])
+
+        return np.add.reduceat(arr == 0x7C, starts).tolist()  # 0x7C == "|"
+
     def to_markdown(self, pdf_bytes: bytes) -> str:
         """
         PDF'i Markdown'a dönüştür (LLM için)
@@ -275,22 +542,48 @@ class PDFToLLMPreparator:
         Returns:
             str: Markdown içeriği
         """
-        doc = self.prepare(pdf_bytes)
-        md_content = []
+        if PYMUPDF4LLM_AVAILABLE:
+            # Hazır C destekli yol: markdown'ı pymupdf4llm üretir,
+            # Python tarafında blok birleştirme döngüsü çalışmaz
+            try:
+                with fitz.open(stream=pdf_bytes, filetype="pdf") as fdoc:
+                    return pymupdf4llm.to_markdown(fdoc)
+            except Exception as e:
+                print(f"pymupdf4llm hızlı yolu başarısız, iç yola dönülüyor: {e}")
+
+        # Çıktı doğrudan StringIO tamponuna yazılır: liste + join'in
+        # ara kopyaları oluşmaz, chunk'lar tembel üretilirken akar
+        if self.detailed_spans:
+            doc = self.prepare(pdf_bytes)
+            title = doc.metadata.get("title", "Untitled")
+            page_count = doc.metadata.get("page_count", 0)
+            text_chunks = doc.text_chunks
+            if text_chunks is None:
+                text_chunks = [c for c in doc.chunks if c.metadata.get("type") == "text"]
+            chunk_iter = iter(text_chunks)
+        else:
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as fdoc:
+                title = fdoc.metadata.get("title", "Untitled")
+                page_count = len(fdoc)
+            chunk_iter = (
+                c for c in self._iter_chunks(pdf_bytes)
+                if c.metadata.get("type") == "text"
+            )
+
+        buf = io.StringIO()
 
         # Frontmatter
-        md_content.append(f"""---
-title: {doc.metadata.get('title', 'Untitled')}
-page_count: {doc.metadata.get('page_count', 0)}
+        buf.write(f"""---
+title: {title}
+page_count: {page_count}
 ---
 """)
 
-        # İçerik
-        for chunk in doc.chunks:
-            if chunk.metadata.get("type") == "text":
-                md_content.append(chunk.text)
+        for chunk in chunk_iter:
+            buf.write("\n\n")
+            buf.write(chunk.text)
 
-        return "\n\n".join(md_content)
+        return buf.getvalue()
 
     def to_json(self, pdf_bytes: bytes) -> str:
         """
@@ -312,7 +605,7 @@ page_count: {doc.metadata.get('page_count', 0)}
                 {
                     "text": chunk.text,
                     "page": chunk.page,
-                    "bbox": chunk.bbox,
+                    "bbox": _bbox_list(chunk.bbox),
                     "metadata": chunk.metadata
                 }
                 for chunk in doc.chunks
@@ -321,6 +614,10 @@ page_count: {doc.metadata.get('page_count', 0)}
             "tables": doc.tables
         }
 
+        # orjson C'de serileştirir ve ara str kopyası üretmez
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+
         return json.dumps(data, ensure_ascii=False, indent=2)
 
     def to_rag_format(self, pdf_bytes: bytes) -> List[Dict]:
@@ -333,17 +630,28 @@ page_count: {doc.metadata.get('page_count', 0)}
         Returns:
             List[Dict]: RAG için doküman parçaları
         """
-        doc = self.prepare(pdf_bytes)
+        # Span detayı isteniyorsa tembel yol yetmez, tam prepare() çalışır
+        if self.detailed_spans:
+            doc = self.prepare(pdf_bytes)
+            source = doc.metadata.get("title", "unknown")
+            chunk_iter = iter(doc.chunks)
+        else:
+            # Tembel yol: chunk'lar üretilirken doğrudan RAG satırına
+            # yazılır, arada LLMDocument kurulmaz
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as fdoc:
+                source = fdoc.metadata.get("title", "unknown")
+            chunk_iter = self._iter_chunks(pdf_bytes)
+
         rag_docs = []
 
-        for i, chunk in enumerate(doc.chunks):
+        for i, chunk in enumerate(chunk_iter):
             rag_docs.append({
                 "id": f"chunk_{i}",
                 "text": chunk.text,
                 "metadata": {
                     "page": chunk.page,
-                    "bbox": chunk.bbox,
-                    "source": doc.metadata.get("title", "unknown")
+                    "bbox": _bbox_list(chunk.bbox),
+                    "source": source
                 }
             })
 
@@ -379,7 +687,7 @@ class LLMEmbeddingPreparator:
                 "text": chunk.text,
                 "metadata": {
                     "page": chunk.page,
-                    "bbox": chunk.bbox,
+                    "bbox": _bbox_list(chunk.bbox),
                     "source": doc.metadata.get("title", "unknown"),
                     "author": doc.metadata.get("author", ""),
                     "chunk_index": i
@@ -6,12 +6,21 @@ Mevcut sisteme DOKUNMADAN çalışır
 """
 
 import io
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 import fitz  # PyMuPDF
 
+try:
+    # pymupdf4llm varsa C destekli markdown çıkarımı kullanılabilir
+    import pymupdf4llm
+    PYMUPDF4LLM_AVAILABLE = True
+except ImportError:
+    PYMUPDF4LLM_AVAILABLE = False
+
 
 @dataclass
 class MarkdownElement:
@@ -30,11 +39,27 @@ class PDFToMarkdownConverter:
 
     __version__ = "1.0.0"
 
+    # Liste/kod sınıflandırması tek derlenmiş kalıpta: blok başına altı
+    # startswith karşılaştırması yerine bir match çağrısı
+    _CLASSIFY_RE = re.compile(r"^(?P<list>[-•*]\s|\d+\.\s)|^(?P<code>```|    )")
+
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self.preserve_images = self.config.get("preserve_images", True)
         self.preserve_tables = self.config.get("preserve_tables", True)
         self.output_format = self.config.get("output_format", "github")  # github, standard
+        # Çok sayfalı PDF'lerde sayfalar thread havuzunda dönüştürülür
+        self.parallel_pages = self.config.get("parallel_pages", True)
+        # Markdown backend'i: auto → pymupdf4llm varsa onu kullan,
+        # "internal" → her zaman blok ayrıştırıcı
+        self.backend = self.config.get("backend", "auto")
+
+        # MuPDF'ten sadece kullanılan alanlar istenir: görseller
+        # korunmayacaksa dict çıkarımı görsel baytlarını hiç taşımaz
+        flags = fitz.TEXTFLAGS_DICT
+        if not self.preserve_images:
+            flags &= ~fitz.TEXT_PRESERVE_IMAGES
+        self._text_flags = flags
 
     def convert(self, pdf_bytes: bytes) -> str:
         """
@@ -46,62 +71,91 @@ class PDFToMarkdownConverter:
         Returns:
             str: Markdown içeriği
         """
+        if PYMUPDF4LLM_AVAILABLE and self.backend in ("auto", "pymupdf4llm"):
+            # MuPDF C katmanı başlık/tablo analizini kendisi yapar; tüm
+            # blok-blok Python döngüsü atlanır
+            try:
+                with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+                    return pymupdf4llm.to_markdown(doc)
+            except Exception as e:
+                print(f"pymupdf4llm backend başarısız, blok ayrıştırıcıya dönülüyor: {e}")
+
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        markdown_content = []
+        page_count = len(doc)
+
+        if self.parallel_pages and page_count > 1:
+            # MuPDF, get_text sırasında GIL'i bırakır: sayfalar thread
+            # havuzunda paralel ayrıştırılır. Paylaşılan Document thread-safe
+            # olmadığı için her görev dokümanı kendisi açar
+            doc.close()
+            workers = min(os.cpu_count() or 1, 8, page_count)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                markdown_content = list(executor.map(
+                    lambda page_num: self._convert_page_bytes(pdf_bytes, page_num),
+                    range(page_count)
+                ))
+        else:
+            try:
+                return self._convert_doc(doc)
+            finally:
+                doc.close()
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_markdown = self._convert_page(page, page_num)
-            markdown_content.append(page_markdown)
+        return "\n\n---\n\n".join(markdown_content)
 
-        doc.close()
+    def _convert_doc(self, doc) -> str:
+        """Açık bir Document'ı Markdown'a dönüştür (kapatmaz)"""
+        markdown_content = []
+
+        # Doğrudan iterasyon: sayfa başına indeksli doc[n] araması yok
+        for page_num, page in enumerate(doc):
+            markdown_content.append(self._convert_page(page, page_num))
 
         return "\n\n---\n\n".join(markdown_content)
 
+    def _convert_page_bytes(self, pdf_bytes: bytes, page_num: int) -> str:
+        """Tek sayfayı kendi Document'ı üzerinden dönüştür (thread görevi)"""
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            return self._convert_page(doc[page_num], page_num)
+        finally:
+            doc.close()
+
     def _convert_page(self, page, page_num: int) -> str:
-        """Sayfayı Markdown'a dönüştür"""
-        blocks = page.get_text("dict")["blocks"]
-        elements = []
-        images = []
+        """Sayfayı Markdown'a dönüştür (tek geçişte)"""
+        blocks = page.get_text("dict", flags=self._text_flags)["blocks"]
 
-        # Blokları analiz et
-        for block in blocks:
-            if block["type"] == 0:  # Text
-                element = self._parse_text_block(block)
-                if element:
-                    elements.append(element)
-            elif block["type"] == 1:  # Image
-                if self.preserve_images:
-                    img_info = self._parse_image_block(block, page_num)
-                    if img_info:
-                        images.append(img_info)
-
-        # Elementleri Markdown'a çevir
+        # Bloklar tek geçişte doğrudan Markdown'a yazılır: ara element
+        # listeleri ve blok başına dataclass ayırma yok
         markdown_parts = []
+        image_parts = []
 
-        # Başlıklar ve metin
-        for element in elements:
-            md_text = self._element_to_markdown(element)
-            if md_text:
-                markdown_parts.append(md_text)
+        for block in blocks:
+            if block["type"] == 0:  # Text
+                md_text = self._parse_text_block(block)
+                if md_text:
+                    markdown_parts.append(md_text)
+            elif block["type"] == 1 and self.preserve_images:  # Image
+                img_info = self._parse_image_block(block, page_num)
+                if img_info:
+                    image_parts.append(f"![Image]({img_info['name']})")
 
-        # Görseller
-        for img in images:
-            md_text = f"![Image]({img['name']})"
-            markdown_parts.append(md_text)
+        # Görseller sayfa sonunda
+        markdown_parts.extend(image_parts)
 
         return "\n\n".join(markdown_parts)
 
-    def _parse_text_block(self, block: Dict) -> Optional[MarkdownElement]:
-        """Metin bloğunu analiz et"""
+    def _parse_text_block(self, block: Dict) -> Optional[str]:
+        """Metin bloğunu analiz edip doğrudan Markdown'a çevir"""
         lines = []
         font_sizes = []
 
         for line in block.get("lines", []):
-            line_text = ""
-            for span in line.get("spans", []):
-                line_text += span["text"]
-                font_sizes.append(span.get("size", 12))
+            spans = line.get("spans", [])
+
+            # join ile birleştirme: döngüde str += O(n^2)'ye düşebilir
+            line_text = "".join(span["text"] for span in spans)
+            font_sizes.extend(span.get("size", 12) for span in spans)
 
             if line_text.strip():
                 lines.append(line_text.strip())
@@ -118,24 +172,34 @@ class PDFToMarkdownConverter:
         # Başlık kontrolü
         if avg_font > 16 and len(lines) == 1:
             level = 1 if avg_font > 24 else (2 if avg_font > 20 else 3)
-            return MarkdownElement("heading", text, level)
+            return f"{'#' * level} {text}"
+
+        # Liste / kod kontrolü (tek regex geçişi)
+        m = self._CLASSIFY_RE.match(text)
 
-        # Liste kontrolü
-        if text.startswith(("- ", "• ", "* ", "1. ", "2. ", "3. ")):
-            return MarkdownElement("list", text, 0)
+        if m is not None and m.lastgroup == "list":
+            return text
 
-        # Tablo kontrolü (basit)
-        if "|" in text and text.count("|") >= 2:
+        # Tablo kontrolü (basit): tek count çağrısı hem varlığı hem
+        # miktarı test eder, çift tarama yok
+        if text.count("|") >= 2:
             lines_list = text.split("\n")
             if all("|" in line for line in lines_list):
-                return MarkdownElement("table", text, 0)
+                if len(lines_list) >= 2:
+                    # Header separator ekle
+                    header_cols = lines_list[0].split("|")
+                    separator = "|" + "---|" * (len(header_cols) - 1)
+                    return lines_list[0] + "\n" + separator + "\n" + "\n".join(lines_list[1:])
+                return text
 
         # Kod bloğu kontrolü
-        if text.startswith("```") or text.startswith("    "):
-            return MarkdownElement("code", text, 0)
+        if m is not None and m.lastgroup == "code":
+            if not text.startswith("```"):
+                return f"```\n{text}\n```"
+            return text
 
         # Varsayılan: paragraf
-        return MarkdownElement("paragraph", text, 0)
+        return text
 
     def _parse_image_block(self, block: Dict, page_num: int) -> Optional[Dict]:
         """Görsel bloğunu analiz et"""
@@ -149,41 +213,19 @@ class PDFToMarkdownConverter:
         except:
             return None
 
-    def _element_to_markdown(self, element: MarkdownElement) -> str:
-        """Elementi Markdown formatına çevir"""
-        if element.type == "heading":
-            prefix = "#" * element.level
-            return f"{prefix} {element.content}"
-
-        elif element.type == "paragraph":
-            return element.content
-
-        elif element.type == "list":
-            return element.content
-
-        elif element.type == "code":
-            if not element.content.startswith("```"):
-                return f"```\n{element.content}\n```"
-            return element.content
-
-        elif element.type == "table":
-            lines = element.content.split("\n")
-            if len(lines) >= 2:
-                # Header separator ekle
-                header_cols = lines[0].split("|")
-                separator = "|" + "---|" * (len(header_cols) - 1)
-                return lines[0] + "\n" + separator + "\n" + "\n".join(lines[1:])
-            return element.content
-
-        return element.content
-
     def _extract_images(self, pdf_bytes: bytes) -> List[Dict]:
         """PDF'ten görselleri çıkar"""
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            return self._extract_images_from_doc(doc)
+        finally:
+            doc.close()
+
+    def _extract_images_from_doc(self, doc) -> List[Dict]:
+        """Açık bir Document'tan görselleri çıkar (kapatmaz)"""
         images = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        for page_num, page in enumerate(doc):
             image_list = page.get_images()
 
             for img_index, img in enumerate(image_list):
@@ -202,7 +244,6 @@ class PDFToMarkdownConverter:
                         "filename": f"image_p{page_num}_{img_index}.{ext}"
                     })
 
-        doc.close()
         return images
 
 
@@ -218,11 +259,12 @@ class AdvancedMarkdownConverter:
 
     def convert_with_frontmatter(self, pdf_bytes: bytes) -> str:
         """PDF'i Markdown'a (frontmatter ile) dönüştür"""
+        # Doküman bir kez açılır: metadata ve markdown aynı parse'tan gelir
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
 
-        # Metadata
-        metadata = doc.metadata
-        frontmatter = f"""---
+        try:
+            metadata = doc.metadata
+            frontmatter = f"""---
 title: {metadata.get('title', 'Untitled')}
 author: {metadata.get('author', 'Unknown')}
 subject: {metadata.get('subject', '')}
@@ -231,10 +273,9 @@ page_count: {len(doc)}
 ---
 """
 
-        doc.close()
-
-        # Markdown içeriği
-        markdown_content = self.converter.convert(pdf_bytes)
+            markdown_content = self.converter._convert_doc(doc)
+        finally:
+            doc.close()
 
         return frontmatter + "\n\n" + markdown_content
 
@@ -243,8 +284,7 @@ page_count: {len(doc)}
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         slides = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        for page_num, page in enumerate(doc):
             text = page.get_text("text")
 
             # Slayt ayırıcı
@@ -283,7 +323,14 @@ def pdf_to_markdown_with_images(pdf_bytes: bytes, output_dir: str = None) -> tup
         tuple: (markdown_content, images_list)
     """
     converter = PDFToMarkdownConverter({"preserve_images": True})
-    markdown = converter.convert(pdf_bytes)
-    images = converter._extract_images(pdf_bytes)
+
+    # Aynı baytlar iki kez parse edilmesin: doküman bir kez açılır,
+    # markdown ve görseller aynı Document üzerinden çıkar
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        markdown = converter._convert_doc(doc)
+        images = converter._extract_images_from_doc(doc)
+    finally:
+        doc.close()
 
     return markdown, images
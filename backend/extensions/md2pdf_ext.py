@@ -12,109 +12,14 @@ from typing import Dict, Optional, List
 try:
     import markdown
     from xhtml2pdf import pisa
-    from reportlab.lib.pagesizes import letter, A4
     MARKDOWN_PDF_AVAILABLE = True
 except ImportError:
     MARKDOWN_PDF_AVAILABLE = False
 
 
-class MarkdownToPDFConverter:
-    """
-    Markdown'dan PDF'e dönüştürücü
-    Markdown → HTML → PDF
-    """
-
-    __version__ = "1.0.0"
-
-    def __init__(self, config: Optional[Dict] = None):
-        """
-        Markdown to PDF converter başlat
-
-        Args:
-            config: Yapılandırma
-                - page_size: Sayfa boyutu (letter, a4)
-                - margin: Kenar boşlukları
-                - extensions: Markdown extension'ları
-                - theme: Tema (default, github, minimalist)
-        """
-        if not MARKDOWN_PDF_AVAILABLE:
-            raise ImportError("Gerekli kütüphaneler kurulu değil. pip install markdown xhtml2pdf")
-
-        self.config = config or {}
-        self.page_size = self.config.get("page_size", "a4").lower()
-        self.margin = self.config.get("margin", 0.75)
-        self.theme = self.config.get("theme", "default")
-
-        # Markdown extension'ları
-        default_extensions = [
-            "extra",
-            "codehilite",
-            "tables",
-            "toc",
-            "fenced_code",
-            "nl2br",
-            "sane_lists"
-        ]
-        self.extensions = self.config.get("extensions", default_extensions)
-
-        # Markdown'ı başlat
-        self.md = markdown.Markdown(extensions=self.extensions)
-
-    def convert(self, markdown_text: str, output_path: str = None) -> bytes:
-        """
-        Markdown'ı PDF'e dönüştür
-
-        Args:
-            markdown_text: Markdown içeriği
-            output_path: Çıktı dosya yolu (opsiyonel)
-
-        Returns:
-            bytes: PDF bayt verisi
-        """
-        # Markdown'ı HTML'e çevir
-        html = self._markdown_to_html(markdown_text)
-
-        # HTML'i PDF'e çevir
-        return self._html_to_pdf(html, output_path)
-
-    def _markdown_to_html(self, markdown_text: str) -> str:
-        """Markdown'ı HTML'e çevir"""
-        # Markdown'ı sıfırla ve çevir
-        self.md.reset()
-        html = self.md.convert(markdown_text)
-
-        # Temayı uygula
-        styled_html = self._apply_theme(html)
-
-        return styled_html
-
-    def _apply_theme(self, html: str) -> str:
-        """HTML'e tema uygula"""
-        themes = {
-            "default": self._default_theme(),
-            "github": self._github_theme(),
-            "minimalist": self._minimalist_theme()
-        }
-
-        theme_css = themes.get(self.theme, themes["default"])
-
-        return f"""<!DOCTYPE html>
-<html lang="tr">
-<head>
-    <meta charset="UTF-8">
-    <title>Markdown to PDF</title>
-    {theme_css}
-</head>
-<body>
-    <div class="container">
-        {html}
-    </div>
-</body>
-</html>"""
-
-    def _default_theme(self) -> str:
-        """Varsayılan tema CSS"""
-        return """<style>
+# Tema CSS'leri modül sabiti: her convert() çağrısında çok KB'lık
+# string literal'ler yeniden kurulmaz
+_DEFAULT_THEME = """<style>
         body {
             font-family: 'DejaVu Sans', Arial, sans-serif;
             line-height: 1.6;
@@ -181,9 +86,7 @@ class MarkdownToPDFConverter:
         .page-break { page-break-after: always; }
     </style>"""
 
-    def _github_theme(self) -> str:
-        """GitHub benzeri tema"""
-        return """<style>
+_GITHUB_THEME = """<style>
         body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
             line-height: 1.6;
@@ -221,9 +124,7 @@ class MarkdownToPDFConverter:
         a { color: #0969da; text-decoration: none; }
     </style>"""
 
-    def _minimalist_theme(self) -> str:
-        """Minimalist tema"""
-        return """<style>
+_MINIMALIST_THEME = """<style>
         body {
             font-family: 'Georgia', serif;
             line-height: 1.8;
@@ -241,15 +142,131 @@ class MarkdownToPDFConverter:
         table th, table td { border: 1px solid #ccc; padding: 10px; }
     </style>"""
 
+_THEMES = {
+    "default": _DEFAULT_THEME,
+    "github": _GITHUB_THEME,
+    "minimalist": _MINIMALIST_THEME
+}
+
+
+class MarkdownToPDFConverter:
+    """
+    Markdown'dan PDF'e dönüştürücü
+    Markdown → HTML → PDF
+    """
+
+    __version__ = "1.0.0"
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Markdown to PDF converter başlat
+
+        Args:
+            config: Yapılandırma
+                - page_size: Sayfa boyutu (letter, a4)
+                - margin: Kenar boşlukları
+                - extensions: Markdown extension'ları
+                - theme: Tema (default, github, minimalist)
+        """
+        if not MARKDOWN_PDF_AVAILABLE:
+            raise ImportError("Gerekli kütüphaneler kurulu değil. pip install markdown xhtml2pdf")
+
+        self.config = config or {}
+        self.page_size = self.config.get("page_size", "a4").lower()
+        self.margin = self.config.get("margin", 0.75)
+        self.theme = self.config.get("theme", "default")
+
+        # Markdown extension'ları
+        default_extensions = [
+            "extra",
+            "codehilite",
+            "tables",
+            "toc",
+            "fenced_code",
+            "nl2br",
+            "sane_lists"
+        ]
+        self.extensions = self.config.get("extensions", default_extensions)
+
+        # Markdown'ı başlat
+        self.md = markdown.Markdown(extensions=self.extensions)
+
+        # Tema ve HTML kabuğu bir kez kurulur: _apply_theme belge başına
+        # sadece iki string birleştirmesi yapar
+        theme_css = _THEMES.get(self.theme, _DEFAULT_THEME)
+        # xhtml2pdf sayfa boyutunu CSS @page kuralından okur; page_size
+        # config'i burada enjekte edilir (letter, a4, ...)
+        page_css = f"<style>@page {{ size: {self.page_size}; }}</style>"
+        self._shell_prefix = f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+    <meta charset="UTF-8">
+    <title>Markdown to PDF</title>
+    {page_css}
+    {theme_css}
+</head>
+<body>
+    <div class="container">
+        """
+        self._shell_suffix = """
+    </div>
+</body>
+</html>"""
+
+    def convert(self, markdown_text: str, output_path: str = None) -> bytes:
+        """
+        Markdown'ı PDF'e dönüştür
+
+        Args:
+            markdown_text: Markdown içeriği
+            output_path: Çıktı dosya yolu (opsiyonel)
+
+        Returns:
+            bytes: PDF bayt verisi
+        """
+        # Markdown'ı HTML'e çevir
+        html = self._markdown_to_html(markdown_text)
+
+        # HTML'i PDF'e çevir
+        return self._html_to_pdf(html, output_path)
+
+    def _markdown_to_html(self, markdown_text: str) -> str:
+        """Markdown'ı HTML'e çevir"""
+        # Markdown'ı sıfırla ve çevir
+        self.md.reset()
+        html = self.md.convert(markdown_text)
+
+        # Temayı uygula
+        styled_html = self._apply_theme(html)
+
+        return styled_html
+
+    def _apply_theme(self, html: str) -> str:
+        """HTML'e tema uygula (kabuk __init__'te hazırlandı)"""
+        return self._shell_prefix + html + self._shell_suffix
+
+    def _default_theme(self) -> str:
+        """Varsayılan tema CSS"""
+        return _DEFAULT_THEME
+
+    def _github_theme(self) -> str:
+        """GitHub benzeri tema"""
+        return _GITHUB_THEME
+
+    def _minimalist_theme(self) -> str:
+        """Minimalist tema"""
+        return _MINIMALIST_THEME
+
     def _html_to_pdf(self, html: str, output_path: str = None) -> bytes:
         """HTML'i PDF'e çevir"""
         output = io.BytesIO()
 
-        pagesize = A4 if self.page_size == "a4" else letter
-
+        # CreatePDF kendi dokümanını kurar; PMLDocument'ı elle sarmak
+        # hem gereksiz hem ikinci bir parse demekti
         pisa.CreatePDF(
-            output,
-            pisa.PMLDocument(html, encoding="UTF-8", pagesize=pagesize)
+            src=html,
+            dest=output,
+            encoding="UTF-8"
         )
 
         pdf_bytes = output.getvalue()
@@ -303,19 +320,30 @@ class MarkdownToPDFConverter:
         Returns:
             bytes: PDF bayt verisi
         """
-        combined_html = ""
+        # Tek dev HTML yerine belge başına render + fitz ile birleştirme:
+        # bellek toplam içerikle değil tek belgeyle ölçeklenir
+        import fitz  # PyMuPDF (ana bağımlılıklarda zaten var)
 
-        for i, md in enumerate(markdown_files):
-            self.md.reset()
-            html = self.md.convert(md)
+        merged = fitz.open()
 
-            if i > 0:
-                combined_html += '<div class="page-break"></div>'
+        try:
+            for md in markdown_files:
+                self.md.reset()
+                html = self.md.convert(md)
+                part_bytes = self._html_to_pdf(self._apply_theme(html))
 
-            combined_html += html
+                with fitz.open(stream=part_bytes, filetype="pdf") as part:
+                    merged.insert_pdf(part)
 
-        full_html = self._apply_theme(combined_html)
-        return self._html_to_pdf(full_html, output_path)
+            pdf_bytes = merged.tobytes()
+        finally:
+            merged.close()
+
+        if output_path:
+            with open(output_path, "wb") as f:
+                f.write(pdf_bytes)
+
+        return pdf_bytes
 
 
 class SimpleMarkdownToPDF(MarkdownToPDFConverter):
@@ -9,6 +9,7 @@ Türkçe karakter desteği ile
 import io
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -20,6 +21,13 @@ try:
 except ImportError:
     OCR_AVAILABLE = False
 
+# numpy varsa confidence sütunu vektörel işlenir (pandas ile birlikte gelir)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 @dataclass
 class OCRResult:
@@ -31,6 +39,122 @@ class OCRResult:
     blocks: List[Dict]
 
 
+def _avg_confidence(data: Dict) -> float:
+    """
+    OCR sözlüğünden ortalama güveni hesapla
+
+    Tesseract geçersiz girdileri negatif conf ile işaretler; numpy varsa
+    binlerce token'lık conf sütunu tek vektörel geçişte süzülür.
+    """
+    if NUMPY_AVAILABLE:
+        conf_arr = np.asarray(data["conf"], dtype=np.int32)
+        valid = conf_arr[conf_arr >= 0]
+        return float(valid.mean()) if valid.size else 0.0
+
+    # Output.DICT conf'u int döndürür (geçersiz = -1); string savunması gereksiz
+    confidences = [conf for conf in data["conf"] if conf >= 0]
+    return sum(confidences) / len(confidences) if confidences else 0
+
+
+def _text_from_data(data: Dict) -> str:
+    """
+    OCR sözlüğünden metni geri kur
+
+    image_to_data çıktısı kelimeleri blok/paragraf/satır numaralarıyla
+    taşır: satır değişiminde newline, blok/paragraf değişiminde boş
+    satır eklenerek image_to_string benzeri düzen elde edilir.
+    """
+    parts = []
+    last_key = None
+
+    block_nums = data["block_num"]
+    par_nums = data["par_num"]
+    line_nums = data["line_num"]
+
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+
+        key = (block_nums[i], par_nums[i], line_nums[i])
+
+        if last_key is not None:
+            if key[:2] != last_key[:2]:
+                parts.append("\n\n")
+            elif key != last_key:
+                parts.append("\n")
+            else:
+                parts.append(" ")
+
+        parts.append(word)
+        last_key = key
+
+    return "".join(parts)
+
+
+def _ocr_rendered(img, lang: str, with_confidence: bool = True) -> Tuple[str, float]:
+    """
+    Render edilmiş sayfa görselini OCR'la, (metin, ortalama güven) döndür
+
+    Tek image_to_data çağrısı hem metni hem güveni verir: image_to_string
+    için aynı görsel üzerinde ikinci bir Tesseract geçişi çalıştırılmaz.
+    Güven istenmediğinde image_to_string yeterli: koca DICT çıktısı ve
+    Python tarafındaki metin geri kurma da atlanır.
+    """
+    if not with_confidence:
+        text = pytesseract.image_to_string(
+            img,
+            lang=lang,
+            config='--psm 6'  # Tek sütunlu varsayılan
+        )
+        return text, 0.0
+
+    data = pytesseract.image_to_data(
+        img,
+        lang=lang,
+        config='--psm 6',  # Tek sütunlu varsayılan
+        output_type=pytesseract.Output.DICT
+    )
+
+    return _text_from_data(data), _avg_confidence(data)
+
+
+def _render_page(page, mat):
+    """
+    Sayfayı OCR için pixmap'ten PIL görseline çevir
+
+    Ham pixel tamponu doğrudan sarılır: PNG encode + decode turu
+    (sayfa başına megabaytlarca zlib trafiği) atlanır. Tesseract içeride
+    zaten gri tona çevirdiğinden render doğrudan csGRAY yapılır: piksel
+    başına 1 bayt, RGB'ye göre ~3x daha az bellek trafiği. Matrix
+    çağıran tarafta bir kez kurulur, sayfa başına yeniden yaratılmaz.
+    """
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def _ocr_raw_image(samples: bytes, size: Tuple[int, int], mode: str, lang: str,
+                   with_confidence: bool = True) -> Tuple[str, float]:
+    """
+    Process pool worker'ı: ham pixel tamponundan OCR
+
+    Sayfalar parent'ta render edilir; worker'a PDF baytları yerine
+    pix.samples + (boyut, mod) gider. Worker dokümanı yeniden açmaz ve
+    pipe'tan PNG yerine sıkıştırmasız tampon geçer.
+    """
+    img = Image.frombytes(mode, size, samples)
+    return _ocr_rendered(img, lang, with_confidence)
+
+
+def _ocr_raw_image_data(samples: bytes, size: Tuple[int, int], mode: str, lang: str) -> Dict:
+    """Process pool worker'ı: ham pixel tamponundan detaylı OCR sözlüğü"""
+    img = Image.frombytes(mode, size, samples)
+    return pytesseract.image_to_data(
+        img,
+        lang=lang,
+        output_type=pytesseract.Output.DICT
+    )
+
+
 class OCRService:
     """
     Tesseract OCR servis wrapper'ı
@@ -84,19 +208,32 @@ class OCRService:
         # Varsayılan dil
         self.default_lang = self.config.get("language", "tr")
 
+        # OCR CPU ağırlıklı: çok sayfalı PDF'ler process havuzuna dağıtılır
+        self.num_workers = self.config.get(
+            "num_workers",
+            min(os.cpu_count() or 1, 4)
+        )
+
         # Kullanılabilirlik kontrolü
         self.available = self.check_available()
 
+    # Versiyon kontrolü bir subprocess fork'u: sonuç process ömrünce
+    # sınıf seviyesinde cache'lenir, her instance yeniden sormaz
+    _available = None
+
     def check_available(self) -> bool:
-        """Tesseract kurulu mu kontrol et"""
-        try:
-            version = pytesseract.get_tesseract_version()
-            return True
-        except Exception:
-            return False
+        """Tesseract kurulu mu kontrol et (sonuç cache'li)"""
+        if OCRService._available is None:
+            try:
+                pytesseract.get_tesseract_version()
+                OCRService._available = True
+            except Exception:
+                OCRService._available = False
+
+        return OCRService._available
 
     def ocr_pdf(self, pdf_bytes: bytes, lang: str = "tr",
-               dpi: int = 300) -> OCRResult:
+               dpi: int = 300, with_confidence: bool = False) -> OCRResult:
         """
         PDF üzerinde OCR yap
 
@@ -104,6 +241,8 @@ class OCRService:
             pdf_bytes: PDF bayt verisi
             lang: Dil kodu (tr, en, de, vb.)
             dpi: DPI değeri
+            with_confidence: Ortalama güven hesaplansın mı (daha pahalı
+                image_to_data geçişi gerektirir; kapalıyken 0 döner)
 
         Returns:
             OCRResult: OCR sonucu
@@ -112,49 +251,58 @@ class OCRService:
         tesseract_lang = self.LANGUAGES.get(lang.lower(), lang)
 
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        page_count = len(doc)
+
         all_text = []
         total_confidence = 0
         block_count = 0
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        workers = min(self.num_workers, page_count)
 
-            # Sayfayı yüksek DPI'da pixmap olarak al
+        if workers > 1:
+            # Tesseract sayfa başına CPU'yu doyurur: render parent'ta
+            # (MuPDF hızlı), OCR process havuzunda. Futures listesi sayfa
+            # sırasında olduğundan sonuçlar sıralamasız toplanır
             mat = fitz.Matrix(dpi / 72, dpi / 72)
-            pix = page.get_pixmap(matrix=mat)
-
-            # PIL Image'a çevir
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
 
-            # OCR yap
-            text = pytesseract.image_to_string(
-                img,
-                lang=tesseract_lang,
-                config='--psm 6'  # Tek sütunlu varsayılan
-            )
-
-            # Detaylı OCR (confidence ile)
-            data = pytesseract.image_to_data(
-                img,
-                lang=tesseract_lang,
-                output_type=pytesseract.Output.DICT
-            )
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = []
+
+                for page in doc:
+                    # Gri ton render: OCR için renk gereksiz, tampon 3x küçük
+                    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+                    futures.append(pool.submit(
+                        _ocr_raw_image,
+                        pix.samples, (pix.width, pix.height), "L", tesseract_lang,
+                        with_confidence
+                    ))
+
+                doc.close()
+
+                for future in futures:
+                    text, avg_conf = future.result()
+                    all_text.append(text)
+                    total_confidence += avg_conf
+                    block_count += 1
+        else:
+            # Sayfa başına değişmeyenler döngü dışında kurulur
+            mat = fitz.Matrix(dpi / 72, dpi / 72)
 
-            # Ortalama confidence hesapla
-            confidences = [int(conf) for conf in data["conf"] if str(conf).isdigit()]
-            avg_conf = sum(confidences) / len(confidences) if confidences else 0
+            for page in doc:
+                img = _render_page(page, mat)
+                text, avg_conf = _ocr_rendered(img, tesseract_lang, with_confidence)
 
-            all_text.append(text)
-            total_confidence += avg_conf
-            block_count += 1
+                all_text.append(text)
+                total_confidence += avg_conf
+                block_count += 1
 
-        doc.close()
+            doc.close()
 
         return OCRResult(
             text="\n\n".join(all_text),
             confidence=total_confidence / block_count if block_count > 0 else 0,
             language=tesseract_lang,
-            pages=len(doc),
+            pages=page_count,
             blocks=[]
         )
 
@@ -173,23 +321,8 @@ class OCRService:
 
         img = Image.open(io.BytesIO(image_bytes))
 
-        # OCR yap
-        text = pytesseract.image_to_string(
-            img,
-            lang=tesseract_lang,
-            config='--psm 6'
-        )
-
-        # Detaylı data
-        data = pytesseract.image_to_data(
-            img,
-            lang=tesseract_lang,
-            output_type=pytesseract.Output.DICT
-        )
-
-        # Confidence hesapla
-        confidences = [int(conf) for conf in data["conf"] if str(conf).isdigit()]
-        avg_conf = sum(confidences) / len(confidences) if confidences else 0
+        # Tek Tesseract geçişi: metin + güven aynı sözlükten
+        text, avg_conf = _ocr_rendered(img, tesseract_lang)
 
         return OCRResult(
             text=text,
@@ -215,43 +348,89 @@ class OCRService:
         tesseract_lang = self.LANGUAGES.get(lang.lower(), lang)
 
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        page_count = len(doc)
         all_boxes = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        workers = min(self.num_workers, page_count)
+
+        if workers > 1:
+            # Render parent'ta, OCR havuzda; worker'lar ham OCR sözlüğünü
+            # döndürür, kutular parent'ta sayfa sırasıyla birleştirilir
             mat = fitz.Matrix(dpi / 72, dpi / 72)
-            pix = page.get_pixmap(matrix=mat)
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
-
-            # Detaylı OCR
-            data = pytesseract.image_to_data(
-                img,
-                lang=tesseract_lang,
-                output_type=pytesseract.Output.DICT
-            )
-
-            # Metin kutularını çıkar
-            n_boxes = len(data["text"])
-            for i in range(n_boxes):
-                text = data["text"][i].strip()
-                conf = int(data["conf"][i]) if str(data["conf"][i]).isdigit() else 0
-
-                if text and conf > 30:  # Min confidence
-                    all_boxes.append({
-                        "page": page_num,
-                        "text": text,
-                        "confidence": conf,
-                        "bbox": (
-                            data["left"][i],
-                            data["top"][i],
-                            data["left"][i] + data["width"][i],
-                            data["top"][i] + data["height"][i]
-                        )
-                    })
-
-        doc.close()
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = []
+
+                for page in doc:
+                    # Gri ton render: OCR için renk gereksiz, tampon 3x küçük
+                    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+                    futures.append(pool.submit(
+                        _ocr_raw_image_data,
+                        pix.samples, (pix.width, pix.height), "L", tesseract_lang
+                    ))
+
+                doc.close()
+
+                for page_num, future in enumerate(futures):
+                    all_boxes.extend(self._boxes_from_data(page_num, future.result()))
+        else:
+            # Sayfa başına değişmeyenler döngü dışında kurulur
+            mat = fitz.Matrix(dpi / 72, dpi / 72)
+            output_dict = pytesseract.Output.DICT
+
+            for page_num, page in enumerate(doc):
+                img = _render_page(page, mat)
+
+                # Detaylı OCR
+                data = pytesseract.image_to_data(
+                    img,
+                    lang=tesseract_lang,
+                    output_type=output_dict
+                )
+
+                all_boxes.extend(self._boxes_from_data(page_num, data))
+
+            doc.close()
+
         return all_boxes
 
+    def _boxes_from_data(self, page_num: int, data: Dict) -> List[Dict]:
+        """OCR sözlüğünden metin kutularını çıkar"""
+        boxes = []
+        texts = data["text"]
+        lefts, tops = data["left"], data["top"]
+        widths, heights = data["width"], data["height"]
+
+        if NUMPY_AVAILABLE:
+            # Min confidence filtresi (>30) tek vektörel karşılaştırmada;
+            # Python döngüsü sadece geçen indekslerde koşar
+            conf_arr = np.asarray(data["conf"], dtype=np.int32)
+            indices = np.flatnonzero(conf_arr > 30).tolist()
+            conf_of = conf_arr.item
+        else:
+            # Output.DICT conf'u int döndürür; string koşulu token başına
+            # iki gereksiz çağrıydı
+            indices = [i for i, conf in enumerate(data["conf"]) if conf > 30]
+            conf_of = data["conf"].__getitem__
+
+        for i in indices:
+            text = texts[i].strip()
+
+            if text:
+                boxes.append({
+                    "page": page_num,
+                    "text": text,
+                    "confidence": conf_of(i),
+                    "bbox": (
+                        lefts[i],
+                        tops[i],
+                        lefts[i] + widths[i],
+                        tops[i] + heights[i]
+                    )
+                })
+
+        return boxes
+
 
 class TurkishOCRService(OCRService):
     """
@@ -269,17 +448,18 @@ class TurkishOCRService(OCRService):
             "Ð": "Ğ",
             "Þ": "Ş"
         }
+        # Tek translate tablosu: altı ayrı replace taraması yerine
+        # metin üzerinde bir lineer geçiş
+        self._tr_table = str.maketrans(self.turkish_chars)
 
     def fix_turkish_chars(self, text: str) -> str:
         """Türkçe karakterleri düzelt"""
-        for wrong, correct in self.turkish_chars.items():
-            text = text.replace(wrong, correct)
-        return text
+        return text.translate(self._tr_table)
 
     def ocr_pdf(self, pdf_bytes: bytes, lang: str = "tr",
-               dpi: int = 300) -> OCRResult:
+               dpi: int = 300, with_confidence: bool = False) -> OCRResult:
         """PDF üzerinde OCR yap (Türkçe karakter düzeltmesi ile)"""
-        result = super().ocr_pdf(pdf_bytes, lang, dpi)
+        result = super().ocr_pdf(pdf_bytes, lang, dpi, with_confidence)
         result.text = self.fix_turkish_chars(result.text)
         return result
 
@@ -291,6 +471,19 @@ class TurkishOCRService(OCRService):
 
 
 # Kolay kullanım fonksiyonları
+_default_service = None
+
+
+def _get_default_service() -> "TurkishOCRService":
+    """Kolay fonksiyonlar için paylaşılan servis (çağrı başına kurulmaz)"""
+    global _default_service
+
+    if _default_service is None:
+        _default_service = TurkishOCRService()
+
+    return _default_service
+
+
 def ocr_pdf(pdf_bytes: bytes, lang: str = "tr", config: Dict = None) -> str:
     """
     PDF üzerinde OCR yap (kolay fonksiyon)
@@ -303,7 +496,7 @@ def ocr_pdf(pdf_bytes: bytes, lang: str = "tr", config: Dict = None) -> str:
     Returns:
         str: OCR sonucu metin
     """
-    service = TurkishOCRService(config)
+    service = TurkishOCRService(config) if config else _get_default_service()
     result = service.ocr_pdf(pdf_bytes, lang)
     return result.text
 
@@ -320,6 +513,6 @@ def ocr_image(image_bytes: bytes, lang: str = "tr", config: Dict = None) -> str:
     Returns:
         str: OCR sonucu metin
     """
-    service = TurkishOCRService(config)
+    service = TurkishOCRService(config) if config else _get_default_service()
     result = service.ocr_image(image_bytes, lang)
     return result.text
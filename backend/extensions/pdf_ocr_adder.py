@@ -8,7 +8,8 @@ PDF'e görünmez OCR metni ekler (taranmış PDF için)
 
 import io
 import os
-import tempfile
+import shutil
+from functools import lru_cache
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 
@@ -16,11 +17,40 @@ try:
     import fitz  # PyMuPDF
     import pytesseract
     from PIL import Image
-    from ocrmypdf import ocrmypdf
+    import ocrmypdf
+    import pikepdf  # ocrmypdf bağımlılığı, zaten kurulu
     OCRLIB_AVAILABLE = True
 except ImportError:
     OCRLIB_AVAILABLE = False
 
+if OCRLIB_AVAILABLE:
+    # MuPDF'in sayfa başına hata satırları stderr'i doldurmasın
+    fitz.TOOLS.mupdf_display_errors(False)
+
+
+def _shrink_fitz_store():
+    """MuPDF görüntü/font cache'ini boşalt
+
+    fz store varsayılan olarak sınırsız: görsel ağırlıklı taramalarda
+    doküman kapansa bile cache RSS'i 1 GB'ın üstüne itebiliyor. Doküman
+    kapatıldıktan sonra çağrılır ki bellek küçük container'larda iade
+    edilsin.
+    """
+    fitz.TOOLS.store_shrink(100)
+
+
+# Dil kodu normalizasyonu: çağrı başına dict kurmak yerine modülde bir kez
+_OCR_LANG_MAP = {
+    "tr": "tur",
+    "tur": "tur",
+    "turkish": "tur",
+    "en": "eng",
+    "eng": "eng",
+    "english": "eng",
+    "de": "deu",
+    "fr": "fra",
+}
+
 
 @dataclass
 class OCROperationResult:
@@ -77,8 +107,23 @@ class PDFOCRAdder:
         self.deskew = self.config.get("deskew", True)
         self.clean = self.config.get("clean", True)
 
+        # OCRmyPDF sayfa OCR'ını çekirdeklere dağıtabilir; bir çekirdek
+        # web worker'ına bırakılır. Toplam eşzamanlılık kabaca
+        # gunicorn workers * threads * jobs — OCR_JOBS ile sınırlanabilir
+        self.jobs = (
+            self.config.get("jobs")
+            or int(os.environ.get("OCR_JOBS", 0))
+            or max(1, (os.cpu_count() or 2) - 1)
+        )
+
+        # Optimizer seviyesi (0 = kapalı). Küçük container'larda agresif
+        # optimizasyon /tmp'yi doldurabiliyor
+        self.optimize = self.config.get("optimize", 1)
+        os.environ.setdefault("TMPDIR", self.config.get("tmpdir", "/tmp"))
+
     def add_ocr_to_pdf(self, pdf_bytes: bytes, lang: str = "tur",
-                       output_type: str = "pdf") -> OCROperationResult:
+                       output_type: str = "pdf",
+                       skip_text: bool = False) -> OCROperationResult:
         """
         PDF'e OCR ekle
 
@@ -86,71 +131,57 @@ class PDFOCRAdder:
             pdf_bytes: PDF bayt verisi
             lang: Dil kodu (tur, eng, vb.)
             output_type: Çıktı tipi (pdf, pdfa, txt)
+            skip_text: Metni olan sayfaları OCRmyPDF'e atlat
 
         Returns:
             OCROperationResult: OCR sonucu
         """
         # Dil kodunu normalize et
-        lang_map = {
-            "tr": "tur",
-            "tur": "tur",
-            "turkish": "tur",
-            "en": "eng",
-            "eng": "eng",
-            "english": "eng",
-            "de": "deu",
-            "fr": "fra",
-        }
-        ocr_lang = lang_map.get(lang.lower(), lang)
-
-        # Geçici dosyalar oluştur
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as input_pdf:
-            input_pdf.write(pdf_bytes)
-            input_path = input_pdf.name
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as output_pdf:
-            output_path = output_pdf.name
+        ocr_lang = _OCR_LANG_MAP.get(lang.lower(), lang)
 
         try:
-            # OCRmyPDF ile işlem yap
-            args = [
-                input_path,
-                output_path,
-                "-l", ocr_lang,
-                "--dpi", str(self.dpi),
-                "--output-type", output_type
-            ]
-
-            if self.deskew:
-                args.append("--deskew")
-
-            if self.clean:
-                args.append("--clean")
-
-            # OCRmyPDF'ı çalıştır
-            ocrmypdf.ocrmypdf(args, progress_bar=False)
-
-            # Sonucu oku
-            with open(output_path, "rb") as f:
-                result_bytes = f.read()
-
-            # Sayfa sayısı kontrolü
-            doc = fitz.open(stream=result_bytes, filetype="pdf")
-            page_count = len(doc)
+            # Optimizer geçici dosyalarla çalışır: TMPDIR'de 512 MB'tan az
+            # yer varsa /tmp dolmasın diye optimizasyon kapatılır
+            optimize = self.optimize
+            if optimize:
+                free = shutil.disk_usage(os.environ.get("TMPDIR", "/tmp")).free
+                if free < 512 * 1024 * 1024:
+                    print("TMPDIR'de az yer kaldı, OCR optimizasyonu kapatılıyor")
+                    optimize = 0
+
+            # Python API + BytesIO akışı: baytlar geçici dosyalara iki kez
+            # yazılıp geri okunmaz, /tmp baskısı ve ekstra disk turu yok
+            output_buf = io.BytesIO()
+
+            ocrmypdf.ocr(
+                input_file=io.BytesIO(pdf_bytes),
+                output_file=output_buf,
+                language=ocr_lang,
+                image_dpi=self.dpi,
+                output_type=output_type,
+                jobs=self.jobs,
+                optimize=optimize,
+                deskew=self.deskew,
+                clean=self.clean,
+                skip_text=skip_text,
+                progress_bar=False
+            )
 
-            # Metin kontrolü
-            has_text = False
-            for page in doc:
-                if page.get_text("text").strip():
-                    has_text = True
-                    break
-            doc.close()
+            result_bytes = output_buf.getvalue()
+
+            # ocr() istisnasız döndüyse çıktıda metin katmanı var; çıktıyı
+            # doğrulamak için fitz ile baştan parse etmek gereksiz. Sayfa
+            # sayısı pikepdf'ten okunur — yapı yüklemesi fitz'ten çok
+            # daha ucuz, sayfa içerikleri hiç açılmaz
+            output_buf.seek(0)
+            with pikepdf.open(output_buf) as pdf:
+                page_count = len(pdf.pages)
 
             return OCROperationResult(
                 success=True,
                 output_pdf=result_bytes,
                 pages_processed=page_count,
-                text_found=has_text
+                text_found=True
             )
 
         except Exception as e:
@@ -163,17 +194,6 @@ class PDFOCRAdder:
                 error=str(e)
             )
 
-        finally:
-            # Geçici dosyaları temizle
-            try:
-                os.unlink(input_path)
-            except:
-                pass
-            try:
-                os.unlink(output_path)
-            except:
-                pass
-
     def add_ocr_to_scanned_pages(self, pdf_bytes: bytes, lang: str = "tur") -> OCROperationResult:
         """
         Sadece taranmış sayfalara OCR ekle
@@ -185,17 +205,26 @@ class PDFOCRAdder:
         Returns:
             OCROperationResult: OCR sonucu
         """
-        # Önce taranmış sayfaları tespit et
+        # Önce taranmış sayfaları tespit et. Sayfalar load_page ile tek tek
+        # yüklenir ve referans hemen bırakılır: büyük taramalarda tüm
+        # sayfaların aynı anda canlı kalması engellenir
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         scanned_pages = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            # Metin yoksa taranmış sayfa say
-            if not page.get_text("text").strip():
-                scanned_pages.append(page_num)
+        # Tespit için tam metin üretmek gereksiz: blok listesi tek glyph'in
+        # varlığını söylemeye yeter, görsel blokları bayrakla dışlanır
+        block_flags = fitz.TEXTFLAGS_BLOCKS & ~fitz.TEXT_PRESERVE_IMAGES
 
-        doc.close()
+        try:
+            for page_num in range(len(doc)):
+                page = doc.load_page(page_num)
+                # Metin bloğu yoksa taranmış sayfa say
+                if not page.get_text("blocks", flags=block_flags):
+                    scanned_pages.append(page_num)
+                page = None
+        finally:
+            doc.close()
+            _shrink_fitz_store()
 
         if not scanned_pages:
             return OCROperationResult(
@@ -205,8 +234,10 @@ class PDFOCRAdder:
                 text_found=True
             )
 
-        # Tüm PDF'e OCR ekle (OCRmyPDF otomatik tespit yapıyor)
-        return self.add_ocr_to_pdf(pdf_bytes, lang)
+        # skip_text: OCRmyPDF metni olan sayfaları hiç rasterize etmez,
+        # sadece taranmış sayfalar OCR maliyeti öder. Tespit döngüsü artık
+        # yalnızca "hiç taranmış sayfa yok" hızlı dönüşü için duruyor
+        return self.add_ocr_to_pdf(pdf_bytes, lang, skip_text=True)
 
     def make_searchable(self, pdf_bytes: bytes, lang: str = "tur") -> OCROperationResult:
         """
@@ -232,14 +263,41 @@ class PDFOCRAdder:
         Returns:
             str: Çıkarılan metin
         """
-        # Önce normal metin çıkarmayı dene
+        # Önce normal metin çıkarmayı dene. Tüm sayfaları okumadan karar
+        # vermek için ilk birkaç sayfa + orta sayfa örneklenir: taranmış
+        # PDF'te N sayfalık boşuna get_text turu atılmaz, metinli PDF'te
+        # tam çıkarma zaten yapılacak
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         text = ""
 
-        for page in doc:
-            text += page.get_text("text") + "\n\n"
+        try:
+            page_count = len(doc)
+            sample_pages = list(range(min(5, page_count)))
+            midpoint = page_count // 2
+            if midpoint not in sample_pages:
+                sample_pages.append(midpoint)
 
-        doc.close()
+            has_text = False
+            for page_num in sample_pages:
+                page = doc.load_page(page_num)
+                if page.get_text("text").strip():
+                    has_text = True
+                    break
+                page = None
+
+            if has_text:
+                # Parçalar listede toplanıp tek join ile birleştirilir
+                # (str += büyük PDF'te O(N^2) kopya yapar)
+                parts = []
+                for page_num in range(page_count):
+                    page = doc.load_page(page_num)
+                    parts.append(page.get_text("text"))
+                    parts.append("\n\n")
+                    page = None
+                text = "".join(parts)
+        finally:
+            doc.close()
+            _shrink_fitz_store()
 
         # Metin varsa döndür
         if text.strip():
@@ -250,10 +308,17 @@ class PDFOCRAdder:
 
         if result.success:
             doc = fitz.open(stream=result.output_pdf, filetype="pdf")
-            text = ""
-            for page in doc:
-                text += page.get_text("text") + "\n\n"
-            doc.close()
+            parts = []
+            try:
+                for page_num in range(len(doc)):
+                    page = doc.load_page(page_num)
+                    parts.append(page.get_text("text"))
+                    parts.append("\n\n")
+                    page = None
+            finally:
+                doc.close()
+                _shrink_fitz_store()
+            text = "".join(parts)
 
         return text
 
@@ -278,34 +343,32 @@ class TurkishPDFOCRAdder(PDFOCRAdder):
             "Ð": "Ğ",
             "Þ": "Ş"
         }
+        # translate tablosu bir kez kurulur: altı ayrı replace taraması
+        # yerine tek C geçişi
+        self._tr_table = str.maketrans(self.char_corrections)
 
     def fix_turkish_chars(self, text: str) -> str:
         """Türkçe karakterleri düzelt"""
-        for wrong, correct in self.char_corrections.items():
-            text = text.replace(wrong, correct)
-        return text
+        return text.translate(self._tr_table)
 
-    def add_ocr_to_pdf(self, pdf_bytes: bytes, lang: str = "tur",
-                       output_type: str = "pdf") -> OCROperationResult:
-        """PDF'e OCR ekle (Türkçe karakter düzeltmesi ile)"""
-        result = super().add_ocr_to_pdf(pdf_bytes, lang, output_type)
 
-        # Türkçe karakterleri düzelt
-        if result.success:
-            doc = fitz.open(stream=result.output_pdf, filetype="pdf")
+# Kolay kullanım fonksiyonları
+@lru_cache(maxsize=8)
+def _get_adder(cfg_key) -> TurkishPDFOCRAdder:
+    """Aynı yapılandırma için adder'ı bir kez kur ve sakla"""
+    return TurkishPDFOCRAdder(dict(cfg_key) if cfg_key else None)
 
-            # Her sayfayı işle
-            for page in doc:
-                text = page.get_text("text")
-                # Düzeltme gerekmiyor kontrol et
-                # (PyMuPDF zaten UTF-8 destekliyor)
 
-            doc.close()
+def _adder_for(config: Optional[Dict]) -> TurkishPDFOCRAdder:
+    """Kolay fonksiyonlar için cache'li adder (kurulum env okur, pahalı)"""
+    try:
+        cfg_key = frozenset(config.items()) if config else None
+    except TypeError:
+        # Hash'lenemeyen config değeri: cache'siz taze örnek
+        return TurkishPDFOCRAdder(config)
+    return _get_adder(cfg_key)
 
-        return result
 
-
-# Kolay kullanım fonksiyonları
 def add_ocr_to_pdf(pdf_bytes: bytes, lang: str = "tr", config: Dict = None) -> bytes:
     """
     PDF'e OCR ekle (kolay fonksiyon)
@@ -318,7 +381,7 @@ def add_ocr_to_pdf(pdf_bytes: bytes, lang: str = "tr", config: Dict = None) -> b
     Returns:
         bytes: OCR eklenmiş PDF
     """
-    adder = TurkishPDFOCRAdder(config)
+    adder = _adder_for(config)
     result = adder.add_ocr_to_pdf(pdf_bytes, lang)
     return result.output_pdf if result.success else pdf_bytes
 
@@ -335,7 +398,7 @@ def make_pdf_searchable(pdf_bytes: bytes, lang: str = "tr", config: Dict = None)
     Returns:
         bytes: Aranabilir PDF
     """
-    adder = TurkishPDFOCRAdder(config)
+    adder = _adder_for(config)
     result = adder.make_searchable(pdf_bytes, lang)
     return result.output_pdf if result.success else pdf_bytes
 
@@ -352,5 +415,5 @@ def extract_text_with_ocr(pdf_bytes: bytes, lang: str = "tr", config: Dict = Non
     Returns:
         str: Çıkarılan metin
     """
-    adder = TurkishPDFOCRAdder(config)
+    adder = _adder_for(config)
     return adder.extract_text_with_ocr(pdf_bytes, lang)
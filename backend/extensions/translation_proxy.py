@@ -8,10 +8,49 @@ Mevcut sisteme DOKUNMADAN çalışır
 
 import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Tüm proxy çağrıları tek Session üzerinden gider: bağlantılar havuzda
+# tutulur (her istekte TCP+TLS el sıkışması yok) ve geçici 5xx'lerde
+# otomatik retry yapılır
+_SESSION = requests.Session()
+_retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_retry)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers.update({
+    "Accept": "application/json",
+    "Connection": "keep-alive",
+})
+
+# Dil kodu normalizasyonu: proxy örneği başına dict kurmak yerine
+# modülde bir kez
+_LT_LANG_MAP = {
+    "tr": "tr",
+    "turkish": "tr",
+    "en": "en",
+    "english": "en",
+    "de": "de",
+    "german": "de",
+    "fr": "fr",
+    "french": "fr",
+    "es": "es",
+    "spanish": "es",
+    "it": "it",
+    "italian": "it",
+    "ru": "ru",
+    "ar": "ar",
+    "zh": "zh",
+    "ja": "ja",
+}
 
 
 @dataclass
@@ -32,6 +71,11 @@ class LibreTranslateProxy:
 
     __version__ = "1.0.0"
 
+    # /spec probe'u 5 sn'ye kadar bloklayabilir: sonuç URL başına TTL ile
+    # cache'lenir, her proxy kurulumunda yeniden sorulmaz
+    _avail_cache: Dict[str, tuple] = {}
+    _AVAIL_TTL = 60.0
+
     def __init__(self, config: Optional[Dict] = None):
         """
         LibreTranslate proxy başlat
@@ -49,35 +93,31 @@ class LibreTranslateProxy:
         )
         self.api_key = self.config.get("api_key", "")
         self.timeout = self.config.get("timeout", 30)
-        self.available = self.check_available()
-
-        # Dil kodları
-        self.lang_map = {
-            "tr": "tr",
-            "turkish": "tr",
-            "en": "en",
-            "english": "en",
-            "de": "de",
-            "german": "de",
-            "fr": "fr",
-            "french": "fr",
-            "es": "es",
-            "spanish": "es",
-            "it": "it",
-            "italian": "it",
-            "ru": "ru",
-            "ar": "ar",
-            "zh": "zh",
-            "ja": "ja",
-        }
+
+        # Dil kodları (geriye uyumluluk: örnek üzerinden de erişilebilir)
+        self.lang_map = _LT_LANG_MAP
+
+    @property
+    def available(self) -> bool:
+        """Servis erişilebilir mi (tembel, cache'li probe)"""
+        return self.check_available()
 
     def check_available(self) -> bool:
-        """LibreTranslate servisi reachable mi"""
+        """LibreTranslate servisi reachable mi (sonuç TTL ile cache'li)"""
+        now = time.monotonic()
+        cached = self._avail_cache.get(self.url)
+
+        if cached is not None and now - cached[0] < self._AVAIL_TTL:
+            return cached[1]
+
         try:
-            response = requests.get(f"{self.url}/spec", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+            response = _SESSION.get(f"{self.url}/spec", timeout=5)
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+
+        LibreTranslateProxy._avail_cache[self.url] = (now, ok)
+        return ok
 
     def translate(self, text: str, target_lang: str = "tr",
                  source_lang: str = "auto") -> TranslationResult:
@@ -105,6 +145,16 @@ class LibreTranslateProxy:
         target = self.lang_map.get(target_lang.lower(), target_lang)
         source = self.lang_map.get(source_lang.lower(), source_lang)
 
+        # Kaynak ve hedef aynıysa HTTP turu gereksiz
+        if source != "auto" and source == target:
+            return TranslationResult(
+                text=text,
+                source_lang=source,
+                target_lang=target,
+                confidence=1.0,
+                service="libretranslate"
+            )
+
         try:
             payload = {
                 "q": text,
@@ -119,7 +169,7 @@ class LibreTranslateProxy:
             if self.api_key:
                 headers["Authorization"] = f"Bearer {self.api_key}"
 
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.url}/translate",
                 json=payload,
                 headers=headers,
@@ -145,7 +195,7 @@ class LibreTranslateProxy:
                     service="libretranslate"
                 )
 
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"LibreTranslate hatası: {e}")
             return TranslationResult(
                 text=text,
@@ -155,11 +205,18 @@ class LibreTranslateProxy:
                 service="libretranslate"
             )
 
+    # Tek istekte gönderilecek alt partinin toplam karakter sınırı
+    BATCH_MAX_CHARS = 20000
+
     def translate_batch(self, texts: List[str], target_lang: str = "tr",
                        source_lang: str = "auto") -> List[TranslationResult]:
         """
         Toplu metin çevirisi
 
+        /translate uç noktası q için liste kabul eder: N ayrı HTTP turu
+        yerine parti başına tek POST atılır. Liste cevabı desteklemeyen
+        (eski) sunucularda metin başına translate'e geri düşülür.
+
         Args:
             texts: Metin listesi
             target_lang: Hedef dil
@@ -168,21 +225,109 @@ class LibreTranslateProxy:
         Returns:
             List[TranslationResult]: Çeviri sonuçları
         """
+        if not texts:
+            return []
+
+        target = self.lang_map.get(target_lang.lower(), target_lang)
+        source = self.lang_map.get(source_lang.lower(), source_lang)
+
         results = []
 
-        for text in texts:
-            result = self.translate(text, target_lang, source_lang)
-            results.append(result)
+        for chunk in self._chunk_texts(texts):
+            try:
+                results.extend(self._translate_chunk(chunk, target, source))
+            except Exception as e:
+                print(f"LibreTranslate toplu çağrı başarısız, tek tek çevriliyor: {e}")
+                results.extend(self._translate_serial_fallback(chunk, target_lang, source_lang))
 
         return results
 
+    def _translate_serial_fallback(self, chunk: List[str], target_lang: str,
+                                   source_lang: str) -> List[TranslationResult]:
+        """Metin başına çeviri — RTT'ler thread havuzunda örtüşür
+
+        Çeviri saf I/O (requests GIL'i bırakır); self-hosted sunucuyu
+        boğmamak için işçi sayısı sınırlı tutulur.
+        """
+        workers = min(len(chunk), self.config.get("batch_workers", 8), 16)
+
+        if workers <= 1:
+            return [self.translate(text, target_lang, source_lang) for text in chunk]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda text: self.translate(text, target_lang, source_lang),
+                chunk
+            ))
+
+    def _chunk_texts(self, texts: List[str]):
+        """Metinleri toplam karakter sınırına göre alt partilere böl"""
+        batch = []
+        total_chars = 0
+
+        for text in texts:
+            if batch and total_chars + len(text) > self.BATCH_MAX_CHARS:
+                yield batch
+                batch = []
+                total_chars = 0
+
+            batch.append(text)
+            total_chars += len(text)
+
+        if batch:
+            yield batch
+
+    def _translate_chunk(self, chunk: List[str], target: str,
+                         source: str) -> List[TranslationResult]:
+        """Alt partiyi tek /translate çağrısıyla çevir"""
+        payload = {
+            "q": chunk,
+            "target": target,
+            "format": "text"
+        }
+
+        if source != "auto":
+            payload["source"] = source
+
+        headers = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        response = _SESSION.post(
+            f"{self.url}/translate",
+            json=payload,
+            headers=headers,
+            timeout=self.timeout
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+        data = response.json()
+        translated = data.get("translatedText")
+
+        if not isinstance(translated, list) or len(translated) != len(chunk):
+            # Eski sunucu: liste istedik ama düz string döndü
+            raise RuntimeError("liste cevabı desteklenmiyor")
+
+        return [
+            TranslationResult(
+                text=item,
+                source_lang=source,
+                target_lang=target,
+                confidence=1.0,
+                service="libretranslate"
+            )
+            for item in translated
+        ]
+
     def get_supported_languages(self) -> List[Dict]:
         """Desteklenen dilleri al"""
         try:
-            response = requests.get(f"{self.url}/languages", timeout=5)
+            response = _SESSION.get(f"{self.url}/languages", timeout=5)
             if response.status_code == 200:
                 return response.json()
-        except:
+        except (requests.exceptions.RequestException, ValueError):
             pass
 
         # Varsayılan dil listesi
@@ -211,7 +356,7 @@ class LibreTranslateProxy:
         """
         try:
             payload = {"q": text}
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.url}/detect",
                 json=payload,
                 timeout=self.timeout
@@ -222,7 +367,7 @@ class LibreTranslateProxy:
                 if data and len(data) > 0:
                     return data[0]
 
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"Dil tespit hatası: {e}")
 
         return {"language": "unknown", "confidence": 0}
@@ -256,6 +401,22 @@ class HybridTranslator:
 
 
 # Kolay kullanım fonksiyonları
+@lru_cache(maxsize=8)
+def _get_proxy(cfg_key) -> LibreTranslateProxy:
+    """Aynı yapılandırma için proxy'yi bir kez kur ve sakla"""
+    return LibreTranslateProxy(dict(cfg_key) if cfg_key else None)
+
+
+def _proxy_for(config: Optional[Dict]) -> LibreTranslateProxy:
+    """Kolay fonksiyonlar için cache'li proxy"""
+    try:
+        cfg_key = frozenset(config.items()) if config else None
+    except TypeError:
+        # Hash'lenemeyen config değeri: cache'siz taze örnek
+        return LibreTranslateProxy(config)
+    return _get_proxy(cfg_key)
+
+
 def translate_text(text: str, target_lang: str = "tr",
                   source_lang: str = "auto", config: Dict = None) -> str:
     """
@@ -270,7 +431,7 @@ def translate_text(text: str, target_lang: str = "tr",
     Returns:
         str: Çevrilmiş metin
     """
-    proxy = LibreTranslateProxy(config)
+    proxy = _proxy_for(config)
     result = proxy.translate(text, target_lang, source_lang)
     return result.text
 
@@ -286,5 +447,5 @@ def detect_language(text: str, config: Dict = None) -> Dict:
     Returns:
         Dict: {language: str, confidence: float}
     """
-    proxy = LibreTranslateProxy(config)
+    proxy = _proxy_for(config)
     return proxy.detect_language(text)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Gunicorn yapılandırması
+Railway/container dağıtımı için tek dosyada toplanmıştır
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# gthread: sync worker threads'i yoksayıp istekleri serileştiriyordu;
+# gthread ile uzun bir OCR işi sürerken diğer thread'ler çeviri/sağlık
+# isteklerini karşılamaya devam eder. gevent Railway'de çalışmıyor,
+# o yüzden varsayılan gthread (env ile değiştirilebilir)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# Uzun OCR işleri için geniş timeout (30dk), Railway için optimize
+timeout = 1800
+graceful_timeout = 120
+keepalive = 10
+
+# Heartbeat dosyası tmpfs'e yazılır: /tmp disk üzerindeyken PDF OCR
+# sırasında heartbeat'in I/O'ya takılması worker'ı öldürebiliyor
+worker_tmp_dir = "/dev/shm"
+
+# App master'da bir kez import edilir; max_requests geri dönüşümünde
+# worker fork'u bu sayede hızlıdır. Sızıntılara karşı worker periyodik
+# yenilenir, jitter hepsinin aynı anda dönmesini engeller
+preload_app = True
+max_requests = 500
+max_requests_jitter = 50
+
+
+def post_fork(server, worker):
+    """Fork sonrası: GC dondur ve çeviri motorunu worker içinde ısıt
+
+    gc.freeze kalıcı nesneleri permanent generation'a taşır; nesil
+    taramaları ve copy-on-write sayfa kirlenmesi azalır.
+
+    Isıtma master'da (import sırasında) DEĞİL burada yapılır: ısıtma
+    SQLite disk cache bağlantısı ve havuzlanmış TLS soketleri açar;
+    bunlar fork sınırını geçemez (WAL'de bozulma, karışan HTTP
+    yanıtları) ve thread istek ortasındayken fork etmek tanımsızdır.
+    post_fork her worker'da (max_requests geri dönüşümü dahil) koşar,
+    kaynaklar hep worker'ın kendisine ait olur.
+    """
+    import gc
+    gc.freeze()
+
+    if os.environ.get("TRANSLATOR_WARMUP", "1") != "0":
+        try:
+            from translators.hf_translator import warm_up
+            warm_up()
+        except Exception as e:
+            worker.log.warning("Çeviri ısıtması başlatılamadı: %s", e)
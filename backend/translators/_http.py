@@ -0,0 +1,79 @@
+"""
+Çeviri sağlayıcıları için paylaşılan HTTP oturumu
+
+Her translator kendi Session'ını açtığında aynı süreçte birden fazla
+bağımsız connection pool oluşuyordu. Tek oturum keep-alive bağlantıları
+tüm sağlayıcılar arasında paylaştırır; kimlik bilgisi oturuma değil
+istek başına header olarak verilir, böylece HF token'ı başka hostlara
+sızmaz.
+"""
+import os
+import threading
+
+# orjson varsa JSON gövdeleri onunla kodlanır/çözülür (2-5x hızlı,
+# doğrudan bytes üretir); yoksa stdlib json'a düşülür. Her iki hata
+# tipi de ValueError alt sınıfıdır, çağıranların except'leri değişmez
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        """JSON gövdesini bytes olarak kodla"""
+        return orjson.dumps(obj)
+
+    def json_loads(data):
+        """JSON gövdesini çöz (bytes veya str)"""
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def json_dumps(obj) -> bytes:
+        """JSON gövdesini bytes olarak kodla"""
+        return json.dumps(obj).encode("utf-8")
+
+    def json_loads(data):
+        """JSON gövdesini çöz (bytes veya str)"""
+        return json.loads(data)
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_shared_session():
+    """Süreç genelindeki requests.Session örneğini döndür
+
+    İlk çağrıda kurulur (requests importu dahil); sonraki çağrılar
+    kilide girmeden aynı örneği alır.
+    """
+    global _session
+
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # Geçici 429/5xx'lerde otomatik retry; keep-alive pool
+                # worker thread sayısına göre boyutlanır ki havuz dolunca
+                # bağlantılar atılıp yeniden açılmasın
+                workers = int(os.environ.get("TRANSLATOR_PARALLEL_WORKERS", 8))
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 502, 503, 504],
+                    allowed_methods=["GET", "POST"]
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=max(32, 2 * workers),
+                    max_retries=retry
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # JSON gövdeler gzip ile 4-10x küçülür; requests açmayı
+                # kendisi halleder
+                session.headers["Accept-Encoding"] = "gzip"
+                _session = session
+
+    return _session
@@ -0,0 +1,43 @@
+"""
+Çeviri sağlayıcılarının ortak dil tabloları
+
+OPUS model haritası ve NLLB dil kodları hf_translator ile
+multi_translator'da ayrı ayrı tanımlıydı: aynı literal iki kez parse
+ediliyor ve tablolar zamanla birbirinden uzaklaşıyordu. Tek kopya
+burada durur; MappingProxyType tabloları değişmez kılar, kopya isteyen
+dict(...) ile alır.
+"""
+from types import MappingProxyType
+
+# Helsinki-NLP OPUS modelleri - En hızlı ve güvenilir
+OPUS_MODELS = MappingProxyType({
+    ("en", "tr"): "Helsinki-NLP/opus-mt-en-tr",
+    ("tr", "en"): "Helsinki-NLP/opus-mt-tr-en",
+    ("en", "de"): "Helsinki-NLP/opus-mt-en-de",
+    ("de", "en"): "Helsinki-NLP/opus-mt-de-en",
+    ("en", "fr"): "Helsinki-NLP/opus-mt-en-fr",
+    ("fr", "en"): "Helsinki-NLP/opus-mt-fr-en",
+    ("en", "es"): "Helsinki-NLP/opus-mt-en-es",
+    ("es", "en"): "Helsinki-NLP/opus-mt-es-en",
+    ("en", "it"): "Helsinki-NLP/opus-mt-en-it",
+    ("it", "en"): "Helsinki-NLP/opus-mt-it-en",
+    ("en", "ru"): "Helsinki-NLP/opus-mt-en-ru",
+    ("ru", "en"): "Helsinki-NLP/opus-mt-ru-en",
+    ("en", "ar"): "Helsinki-NLP/opus-mt-en-ar",
+    ("ar", "en"): "Helsinki-NLP/opus-mt-ar-en",
+    ("en", "zh"): "Helsinki-NLP/opus-mt-en-zh",
+    ("zh", "en"): "Helsinki-NLP/opus-mt-zh-en",
+    ("de", "tr"): "Helsinki-NLP/opus-mt-de-tr",
+    ("tr", "de"): "Helsinki-NLP/opus-mt-tr-de",
+    ("fr", "tr"): "Helsinki-NLP/opus-mt-fr-tr",
+    ("tr", "fr"): "Helsinki-NLP/opus-mt-tr-fr",
+})
+
+# NLLB dil kodları (Facebook modeli için)
+NLLB_LANG_CODES = MappingProxyType({
+    "en": "eng_Latn", "tr": "tur_Latn", "de": "deu_Latn",
+    "fr": "fra_Latn", "es": "spa_Latn", "it": "ita_Latn",
+    "ru": "rus_Cyrl", "ar": "arb_Arab", "zh": "zho_Hans",
+    "ja": "jpn_Jpan", "ko": "kor_Hang", "nl": "nld_Latn",
+    "pl": "pol_Latn", "pt": "por_Latn", "sv": "swe_Latn",
+})
@@ -7,9 +7,14 @@ Bu modül Gemini kullanılamadığında veya devre dışı bırakıldığında k
 Hugging Face, LibreTranslate veya Argos entegrasyonu için temel oluşturur.
 """
 
+import hashlib
+import logging
 import os
+import re
+import threading
 import time
-import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict
 from dataclasses import dataclass
 
@@ -27,6 +32,209 @@ except ImportError:
     }
 
 
+class TokenBucket:
+    """
+    Basit token bucket hız sınırlayıcı (thread-safe)
+
+    Sağlayıcı kotası sabit sleep'le değil token'la uygulanır: istekler
+    kota içinde arka arkaya gidebilir, kota dolunca acquire bloklar.
+    """
+
+    def __init__(self, rate: float, burst: int = 4):
+        """
+        Args:
+            rate: Saniye başına token (ör. 60/dk kota için 1.0)
+            burst: Aynı anda biriktirilebilecek token sayısı
+        """
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bir token al, gerekiyorsa hazır olana kadar bekle"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class LRUCache:
+    """
+    Sınırlı boyutlu, thread-safe LRU cache
+
+    Sınırsız dict uzun işlerde RSS'i şişiriyordu; burada en eski giriş
+    kapasite aşılınca düşer. Kilit, threaded translate_batch'in aynı
+    cache'e güvenle dokunabilmesi için.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+                return self._data[key]
+            except KeyError:
+                return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskTranslationCache:
+    """
+    SQLite destekli kalıcı çeviri cache'i
+
+    Aynı PDF yerleşim denemeleri sırasında defalarca işlenir; bellek içi
+    cache her süreçte sıfırdan başladığından API maliyeti her seferinde
+    yeniden ödeniyordu. Çeviriler WAL modlu küçük bir SQLite dosyasında
+    saklanır; önde süreç içi LRU durur, disk yalnızca LRU kaçıranlar
+    için okunur. Disk açılamazsa sessizce salt-bellek çalışır.
+    """
+
+    def __init__(self, path: str, maxsize: int = 10000):
+        self._mem = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._conn = None
+
+        try:
+            import sqlite3
+
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.commit()
+        except Exception as e:
+            logger.warning("Disk cache açılamadı, bellek içi cache kullanılacak: %s", e)
+            self._conn = None
+
+    @staticmethod
+    def _disk_key(key: tuple) -> str:
+        """(src, tgt, digest) anahtarını tek metin sütununa indir"""
+        return f"{key[0]}:{key[1]}:{key[2].hex()}"
+
+    def get(self, key):
+        value = self._mem.get(key)
+        if value is not None or self._conn is None:
+            return value
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM translations WHERE key = ?",
+                    (self._disk_key(key),)
+                ).fetchone()
+            except Exception:
+                return None
+
+        if row is not None:
+            self._mem.set(key, row[0])
+            return row[0]
+        return None
+
+    def set(self, key, value):
+        self._mem.set(key, value)
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)",
+                    (self._disk_key(key), value)
+                )
+                self._conn.commit()
+            except Exception:
+                pass
+
+    def clear(self):
+        self._mem.clear()
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM translations")
+                self._conn.commit()
+            except Exception:
+                pass
+
+
+def make_translation_cache():
+    """Çeviri cache'i kur: varsayılan disk destekli, env ile kapatılabilir"""
+    maxsize = int(os.environ.get("TRANSLATOR_CACHE_SIZE", 10000))
+
+    if os.environ.get("TRANSLATOR_DISK_CACHE", "1") == "0":
+        return LRUCache(maxsize=maxsize)
+
+    cache_dir = os.environ.get(
+        "TRANSLATOR_CACHE_DIR", "~/.cache/pdfconverter/translations"
+    )
+    return DiskTranslationCache(
+        os.path.join(os.path.expanduser(cache_dir), "translations.db"),
+        maxsize=maxsize
+    )
+
+
+# Dilden bağımsız segmentler: saf sayı/noktalama ("5.2", "©2024"),
+# URL ve e-posta adresleri. Ağ çağrısı olmadan aynen dönerler
+_PASSTHROUGH_RE = re.compile(r"^[\s\d\W_]+$")
+_URL_EMAIL_RE = re.compile(r"^(https?://|www\.|[\w.+-]+@[\w-]+\.)")
+
+
+def is_passthrough(text: str) -> bool:
+    """Metin çeviri gerektirmeden aynen dönebilir mi"""
+    stripped = text.strip()
+    return (
+        len(stripped) < 2
+        or _PASSTHROUGH_RE.match(text) is not None
+        or _URL_EMAIL_RE.match(stripped) is not None
+    )
+
+
+def cache_key(source_lang: str, target_lang: str, text: str) -> tuple:
+    """Tam metin hash'iyle cache anahtarı üret
+
+    text[:100] tabanlı eski anahtar, ilk 100 karakteri paylaşan iki
+    metni çakıştırıp yanlış çeviri döndürebiliyordu. Blake2b tam metni
+    özetler, anahtar boyutu sabit kalır.
+    """
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    return (source_lang, target_lang, digest)
+
+
+logger = logging.getLogger(__name__)
+
+
 @dataclass
 class TranslationResult:
     """Çeviri sonucu"""
@@ -62,12 +270,29 @@ class FallbackTranslator:
         )
         self.libre_url = os.environ.get("LIBRETRANSLATE_URL", "")
         self.provider = os.environ.get("TRANSLATOR_PROVIDER", "hf")
-        self._cache = {}
+        self._cache = make_translation_cache()
         self._hf_translator = None
+
+        # Süreç genelinde tek Session: keep-alive bağlantıları diğer
+        # translator'larla paylaşılır, her blok için TCP+TLS el
+        # sıkışması tekrarlanmaz. HF token'ı oturuma değil HF
+        # isteklerine header olarak verilir (başka hostlara sızmasın)
+        from translators._http import get_shared_session
+
+        self._session = get_shared_session()
+        self._hf_headers = (
+            {"Authorization": f"Bearer {self.hf_token}"} if self.hf_token else {}
+        )
+
+        # Batch hız sınırı: varsayılan 60 istek/dk (HF ücretsiz kota)
+        rate_per_min = float(os.environ.get("TRANSLATOR_RATE_PER_MIN", 60))
+        self._bucket = TokenBucket(rate=rate_per_min / 60.0, burst=8)
+        self.batch_workers = int(os.environ.get("TRANSLATOR_BATCH_WORKERS", 8))
+        self.hf_batch_size = int(os.environ.get("HF_BATCH_SIZE", 32))
         
         # Hangi provider aktif?
         self.active_provider = self._detect_provider()
-        print(f"🌐 Çeviri Motoru: {self.active_provider}")
+        logger.info("Çeviri motoru: %s", self.active_provider)
 
     def _detect_provider(self) -> str:
         """Aktif provider'ı tespit et"""
@@ -88,8 +313,8 @@ class FallbackTranslator:
     def _get_hf_translator(self):
         """Lazy HF translator al"""
         if self._hf_translator is None:
-            from translators.hf_translator import HuggingFaceTranslator
-            self._hf_translator = HuggingFaceTranslator(self.hf_token)
+            from translators.hf_translator import HFTranslatorV2
+            self._hf_translator = HFTranslatorV2(self.hf_token)
         return self._hf_translator
 
     def translate(self, text: str, target_lang: str = "tr", source_lang: str = "auto",
@@ -117,10 +342,11 @@ class FallbackTranslator:
             )
 
         # Cache kontrolü
-        cache_key = f"{source_lang}:{target_lang}:{text[:100]}"
-        if cache_key in self._cache:
+        key = cache_key(source_lang, target_lang, text)
+        cached = self._cache.get(key)
+        if cached is not None:
             return TranslationResult(
-                text=self._cache[cache_key],
+                text=cached,
                 source_lang=source_lang,
                 target_lang=target_lang,
                 success=True,
@@ -138,7 +364,7 @@ class FallbackTranslator:
                 result = text
                 
             # Cache'e ekle
-            self._cache[cache_key] = result
+            self._cache.set(key, result)
 
             return TranslationResult(
                 text=result,
@@ -149,7 +375,7 @@ class FallbackTranslator:
             )
 
         except Exception as e:
-            print(f"⚠️ Çeviri hatası ({self.active_provider}): {e}")
+            logger.warning("Çeviri hatası (%s): %s", self.active_provider, e)
             # Hata durumunda orijinal metni döndür
             return TranslationResult(
                 text=text,
@@ -179,7 +405,7 @@ class FallbackTranslator:
             "format": "text"
         }
         
-        response = requests.post(
+        response = self._session.post(
             f"{self.libre_url}/translate",
             json=payload,
             timeout=30
@@ -189,20 +415,151 @@ class FallbackTranslator:
         result = response.json()
         return result.get("translatedText", text)
 
+    def _translate_limited(self, text: str, target_lang: str,
+                           source_lang: str) -> TranslationResult:
+        """Token alıp çevir (batch işçileri için)"""
+        self._bucket.acquire()
+        return self.translate(text, target_lang, source_lang)
+
     def translate_batch(self, texts: List[str], target_lang: str = "tr",
                        source_lang: str = "auto") -> List[TranslationResult]:
         """
         Birden çok metni çevir (batch)
+
+        İstekler thread havuzunda örtüşür (çeviri saf I/O), token bucket
+        sağlayıcı kotasını korur. Sonuç sırası girişle aynıdır.
         """
+        if not texts:
+            return []
+
+        # Passthrough ağa çıkmaz, havuz gereksiz
+        if self.active_provider == "passthrough":
+            return [self.translate(text, target_lang, source_lang) for text in texts]
+
+        # PDF'lerde başlık/altbilgi gibi bloklar çok tekrarlanır: her
+        # benzersiz metin bir kez çevrilir, sonuç kopyalara dağıtılır
+        unique_texts = list(dict.fromkeys(texts))
+
+        if self.active_provider == "huggingface":
+            unique_results = self._translate_batch_hf(
+                unique_texts, target_lang, source_lang
+            )
+        else:
+            unique_results = self._translate_batch_threaded(
+                unique_texts, target_lang, source_lang
+            )
+
+        by_text = dict(zip(unique_texts, unique_results))
+        return [by_text[text] for text in texts]
+
+    def _translate_batch_threaded(self, texts: List[str], target_lang: str,
+                                  source_lang: str) -> List[TranslationResult]:
+        """Metin başına istekleri thread havuzunda örtüştür"""
+        workers = min(len(texts), self.batch_workers)
+        results: List[Optional[TranslationResult]] = [None] * len(texts)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._translate_limited, text, target_lang, source_lang): i
+                for i, text in enumerate(texts)
+            }
+
+            done = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                if done % 5 == 0:
+                    logger.debug("Çeviri: %d/%d", done, len(texts))
+
+        return results
+
+    def _translate_batch_hf(self, texts: List[str], target_lang: str,
+                            source_lang: str) -> List[TranslationResult]:
+        """HF Inference'a metinleri parti parti tek istekte gönder
+
+        inputs alanı liste kabul eder ve hizalı liste döner: RTT metin
+        başına değil parti başına ödenir. Beklenmeyen cevapta parti,
+        metin başına thread'li yola düşer.
+
+        Metinler partilere uzunluk sırasıyla dağıtılır: benzer boydaki
+        girdiler aynı partide toplanınca model tarafındaki padding
+        israfı azalır. Sonuçlar çağrı sırasına geri oturtulur.
+        """
+        ordered = sorted(texts, key=len)
+        by_text = {}
+
+        for start in range(0, len(ordered), self.hf_batch_size):
+            chunk = ordered[start:start + self.hf_batch_size]
+            try:
+                chunk_results = self._translate_hf_chunk(chunk, target_lang, source_lang)
+            except Exception as e:
+                logger.warning("HF toplu çağrı başarısız, tek tek çevriliyor: %s", e)
+                chunk_results = self._translate_batch_threaded(chunk, target_lang, source_lang)
+            by_text.update(zip(chunk, chunk_results))
+
+        return [by_text[text] for text in texts]
+
+    def _translate_hf_chunk(self, chunk: List[str], target_lang: str,
+                            source_lang: str) -> List[TranslationResult]:
+        """Bir partiyi tek HF çağrısıyla çevir (cache'tekiler gönderilmez)"""
+        # Blake2b anahtarı metin başına bir kez hesaplanır; filtre,
+        # yazma ve okuma aynı anahtarı paylaşır
+        keys = {text: cache_key(source_lang, target_lang, text) for text in chunk}
+
+        to_send = [
+            text for text in chunk
+            if text.strip() and self._cache.get(keys[text]) is None
+        ]
+
+        if to_send:
+            from translators.hf_translator import NLLB_LANG_CODES, OPUS_MODELS
+
+            src = "en" if source_lang == "auto" else source_lang
+            model = OPUS_MODELS.get((src, target_lang), "facebook/nllb-200-distilled-600M")
+            api_url = f"https://router.huggingface.co/hf-inference/models/{model}"
+
+            payload = {"inputs": to_send, "options": {"wait_for_model": True}}
+            if "nllb" in model.lower():
+                payload["parameters"] = {
+                    "src_lang": NLLB_LANG_CODES.get(src, "eng_Latn"),
+                    "tgt_lang": NLLB_LANG_CODES.get(target_lang, "tur_Latn"),
+                }
+
+            self._bucket.acquire()
+            response = self._session.post(
+                api_url, headers=self._hf_headers, json=payload, timeout=120
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if not isinstance(data, list) or len(data) != len(to_send):
+                raise ValueError("HF cevabı hizalı liste değil")
+
+            for text, item in zip(to_send, data):
+                translated = item.get("translation_text", text) if isinstance(item, dict) else text
+                self._cache.set(keys[text], translated)
+
         results = []
-        for i, text in enumerate(texts):
-            if i % 5 == 0:
-                print(f"📝 Çeviri: {i}/{len(texts)}")
-            result = self.translate(text, target_lang, source_lang)
-            results.append(result)
-            # Rate limiting
-            if i > 0 and i % 5 == 0:
-                time.sleep(0.3)
+        for text in chunk:
+            if not text.strip():
+                results.append(TranslationResult(
+                    text=text,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    success=True,
+                    provider=self.active_provider
+                ))
+                continue
+
+            translated = self._cache.get(keys[text])
+            results.append(TranslationResult(
+                text=translated if translated is not None else text,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                success=translated is not None,
+                provider=self.active_provider
+            ))
+
         return results
 
     def translate_blocks(self, blocks: List[Dict], target_lang: str = "tr",
@@ -210,7 +567,7 @@ class FallbackTranslator:
         """Metin bloklarını çevir"""
         texts = [block.get("text", "") for block in blocks]
         results = self.translate_batch(texts, target_lang, source_lang)
-        return [r.text if r.success else texts[i] for i, r in enumerate(results)]
+        return [r.text if r.success else t for t, r in zip(texts, results)]
 
     def clear_cache(self):
         """Çeviri cache'ini temizle"""
@@ -223,11 +580,16 @@ class FallbackTranslator:
 
 # Singleton instance
 _fallback_instance = None
+_fallback_lock = threading.Lock()
 
 
 def get_fallback_translator() -> FallbackTranslator:
     """Singleton fallback translator örneği al"""
     global _fallback_instance
     if _fallback_instance is None:
-        _fallback_instance = FallbackTranslator()
+        # Double-checked locking: gthread worker'ında eş zamanlı ilk
+        # istekler birden fazla translator (ve session) kurmasın
+        with _fallback_lock:
+            if _fallback_instance is None:
+                _fallback_instance = FallbackTranslator()
     return _fallback_instance
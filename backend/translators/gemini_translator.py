@@ -4,11 +4,24 @@ Gemini Translator - AI Çeviri Modülü
 Google Gemini API ile profesyonel çeviri
 """
 
+import logging
+import os
+import random
+import re
+import threading
 import time
-import google.generativeai as genai
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import Optional, List, Dict
 from dataclasses import dataclass
 
+from translators.fallback_translator import (
+    TokenBucket,
+    cache_key,
+    make_translation_cache,
+)
+
 from config import (
     GEMINI_API_KEY,
     AI_MODEL,
@@ -19,6 +32,68 @@ from config import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Dilden bağımsız metinler ("2024", "p. 12", "—" vb.): API çağrısı
+# olmadan aynen döner
+_PASSTHROUGH_RE = re.compile(r"^[\s\d\W_]+$")
+_NUM_RE = re.compile(r"^[A-Za-z]{0,3}[\s.,:;]*\d[\d\s.,:/\-]*$")
+
+
+def _is_passthrough(text: str) -> bool:
+    """Metin çeviri gerektirmeden aynen dönebilir mi"""
+    return (
+        len(text) < 2
+        or _PASSTHROUGH_RE.match(text) is not None
+        or _NUM_RE.match(text) is not None
+    )
+
+
+# genai.configure süreç genelinde bir kez çalışır: çift kurulumda grpc
+# stub'larının yeniden başlatılmasını kilit engeller
+_genai_module = None
+_genai_lock = threading.Lock()
+
+
+def _configure_once(api_key: str):
+    """google.generativeai'yi import edip tek sefer yapılandır"""
+    global _genai_module
+
+    if _genai_module is None:
+        with _genai_lock:
+            if _genai_module is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=api_key)
+                _genai_module = genai
+
+    return _genai_module
+
+
+# max_output_tokens sınırına takılmadan tek çağrıda çevrilebilecek
+# yaklaşık üst karakter sayısı; üstü cümle sınırlarından parçalanır
+_LONG_TEXT_CHARS = int(os.environ.get("AI_LONG_TEXT_CHARS", 3000))
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+(?=[A-ZÇĞİÖŞÜ])")
+
+
+def _split_sentences(text: str, max_chars: int = _LONG_TEXT_CHARS) -> List[str]:
+    """Uzun metni cümle sınırlarından max_chars'lık parçalara böl"""
+    chunks = []
+    current = []
+    length = 0
+
+    for sentence in _SENT_SPLIT_RE.split(text):
+        if current and length + len(sentence) > max_chars:
+            chunks.append(" ".join(current))
+            current, length = [], 0
+        current.append(sentence)
+        length += len(sentence) + 1
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
 @dataclass
 class TranslationResult:
     """Çeviri sonucu"""
@@ -66,6 +141,37 @@ class ContextManager:
         }
     }
 
+    # Anahtar kelimeler tek derlenmiş kalıba sıkıştırılır: kategori ×
+    # kelime başına ayrı substring taraması yerine metin üzerinde tek
+    # regex geçişi yapılır
+    _KEYWORDS = {
+        "legal": ["mahkeme", "dava", "hukuk", "yasa", "kanun", "madde", "fıkra",
+                  "court", "law", "legal", "article", "contract", "agreement"],
+        "medical": ["hasta", "tedavi", "tanı", "ilaç", "rapor", "sağlık",
+                    "patient", "treatment", "diagnosis", "medical", "health"],
+        "business": ["fatura", "sözleşme", "şirket", "müşteri", "sipariş",
+                     "invoice", "company", "customer", "order", "business"],
+        "academic": ["araştırma", "çalışma", "makale", "tezi", "üniversite",
+                     "research", "study", "paper", "thesis", "university"]
+    }
+    _WORD_TO_CAT = {word: cat for cat, words in _KEYWORDS.items() for word in words}
+    # str.lower() Türkçe İ'yi birleşik noktalı i̇'ye katlar ve sözlük
+    # anahtarını ıskalar; sabit çeviri tablosu hem bunu düzeltir hem
+    # tam Unicode casefold maliyetinden kaçınır. Büyük I her zaman
+    # i'ye iner, o yüzden ı içeren anahtarların i'li varyantı da eklenir
+    _FOLD = str.maketrans(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZÇĞİÖŞÜ",
+        "abcdefghijklmnopqrstuvwxyzçğiöşü"
+    )
+    _WORD_TO_CAT.update({
+        word.replace("ı", "i"): cat
+        for word, cat in list(_WORD_TO_CAT.items()) if "ı" in word
+    })
+    _KEYWORD_RE = re.compile(
+        "|".join(map(re.escape, _WORD_TO_CAT)),
+        re.IGNORECASE
+    )
+
     @staticmethod
     def detect_document_type(text: str) -> str:
         """
@@ -77,30 +183,29 @@ class ContextManager:
         Returns:
             str: Belge türü
         """
-        keywords = {
-            "legal": ["mahkeme", "dava", "hukuk", "yasa", "kanun", "madde", "fıkra",
-                     "court", "law", "legal", "article", "contract", "agreement"],
-            "medical": ["hasta", "tedavi", "tanı", "ilaç", "rapor", "sağlık",
-                       "patient", "treatment", "diagnosis", "medical", "health"],
-            "business": ["fatura", "sözleşme", "şirket", "müşteri", "sipariş",
-                        "invoice", "company", "customer", "order", "business"],
-            "academic": ["araştırma", "çalışma", "makale", "tezi", "üniversite",
-                        "research", "study", "paper", "thesis", "university"]
-        }
-
-        text_lower = text.lower()
-        scores = {}
+        # İlk 512 karakter tespit için yeterli; lru_cache aynı belgede
+        # blok başına tekrarlanan tespit maliyetini sıfırlar
+        return ContextManager._detect_cached(text[:512])
 
-        for doc_type, words in keywords.items():
-            scores[doc_type] = sum(1 for word in words if word in text_lower)
-
-        # En yüksek puanlı türü seç
-        if scores:
-            max_type = max(scores, key=scores.get)
-            if scores[max_type] > 0:
-                return max_type
-
-        return "general"
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _detect_cached(prefix: str) -> str:
+        """Kısaltılmış metinden belge türü puanla (cache'li)"""
+        hits = ContextManager._KEYWORD_RE.findall(prefix)
+        if not hits:
+            return "general"
+
+        scores = Counter()
+        word_to_cat = ContextManager._WORD_TO_CAT
+        fold = ContextManager._FOLD
+        for hit in hits:
+            cat = word_to_cat.get(hit.translate(fold))
+            if cat:
+                scores[cat] += 1
+
+        if not scores:
+            return "general"
+        return scores.most_common(1)[0][0]
 
     @staticmethod
     def build_prompt(text: str, target_lang: str, source_lang: str = "auto",
@@ -121,12 +226,21 @@ class ContextManager:
         if doc_type is None:
             doc_type = ContextManager.detect_document_type(text)
 
+        # Prompt'un metin dışındaki kısmı (doc_type, target_lang) başına
+        # sabittir; bin bloklu belgede her çağrıda yeniden formatlamak
+        # yerine önbellekten alınıp metinle birleştirilir
+        return ContextManager._prompt_prefix(doc_type, target_lang) + text
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _prompt_prefix(doc_type: str, target_lang: str) -> str:
+        """(doc_type, target_lang) için sabit prompt başlığını üret"""
         doc_info = ContextManager.DOCUMENT_TYPES.get(doc_type,
                      ContextManager.DOCUMENT_TYPES["general"])
 
         target_name = LANGUAGE_NAMES.get(target_lang, target_lang)
 
-        prompt = f"""Sen profesyonel bir çevirmensin. Aşağıdaki metni {target_name}'ye çevir.
+        return f"""Sen profesyonel bir çevirmensin. Aşağıdaki metni {target_name}'ye çevir.
 
 Belge Türü: {doc_info['name']}
 Bağlam: {doc_info['context']}
@@ -140,9 +254,7 @@ Kurallar:
 5. Profesyonel ve doğal bir dil kullan
 
 Çevrilecek Metin:
-{text}"""
-
-        return prompt
+"""
 
 
 class GeminiTranslator:
@@ -162,12 +274,24 @@ class GeminiTranslator:
         self.api_key = api_key or GEMINI_API_KEY
         self.model_name = model or AI_MODEL
         self._init_model()
-        self._cache = {}
+        self._cache = make_translation_cache()
+
+        # Batch hız sınırı: varsayılan 15 istek/dk (Gemini ücretsiz kota)
+        rate_per_min = float(os.environ.get("GEMINI_RATE_PER_MIN", 15))
+        self._bucket = TokenBucket(rate=rate_per_min / 60.0, burst=4)
+        self.batch_workers = int(os.environ.get("GEMINI_BATCH_WORKERS", 4))
+
+        # API'ye gitmeden aynen dönen metin sayacı (metrik)
+        self.skipped_count = 0
 
     def _init_model(self):
-        """Modeli başlat"""
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(self.model_name)
+        """Modeli başlat
+
+        google.generativeai burada import edilir: grpc/protobuf zinciri
+        (~50 MB, yüzlerce ms) ancak Gemini gerçekten kullanılırsa yüklenir.
+        """
+        self._genai = _configure_once(self.api_key)
+        self.model = self._genai.GenerativeModel(self.model_name)
 
     def translate(self, text: str, target_lang: str = "tr", source_lang: str = "auto",
                  doc_type: str = None, preserve_format: bool = True) -> TranslationResult:
@@ -192,16 +316,46 @@ class GeminiTranslator:
                 success=True
             )
 
+        # Saf sayı/tarih/noktalama veya tek karakter: çeviri değişmez,
+        # round-trip ve token maliyeti boşa gider
+        if _is_passthrough(text):
+            self.skipped_count += 1
+            return TranslationResult(
+                text=text,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                success=True
+            )
+
         # Cache kontrolü
-        cache_key = f"{source_lang}:{target_lang}:{text[:100]}"
-        if cache_key in self._cache:
+        key = cache_key(source_lang, target_lang, text)
+        cached = self._cache.get(key)
+        if cached is not None:
             return TranslationResult(
-                text=self._cache[cache_key],
+                text=cached,
                 source_lang=source_lang,
                 target_lang=target_lang,
                 success=True
             )
 
+        # Uzun paragraflar max_output_tokens sınırında kuyruğu
+        # kaybediyordu: cümle sınırlarından parçala, paralel batch
+        # yolundan geçir ve sırayla birleştir
+        if len(text) > _LONG_TEXT_CHARS:
+            pieces = _split_sentences(text)
+            if len(pieces) > 1:
+                piece_results = self.translate_batch(pieces, target_lang, source_lang)
+                result = " ".join(r.text for r in piece_results)
+                success = all(r.success for r in piece_results)
+                if success:
+                    self._cache.set(key, result)
+                return TranslationResult(
+                    text=result,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    success=success
+                )
+
         # Prompt oluştur
         prompt = ContextManager.build_prompt(
             text, target_lang, source_lang, doc_type, preserve_format
@@ -212,16 +366,30 @@ class GeminiTranslator:
             try:
                 response = self.model.generate_content(
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
+                    generation_config=self._genai.types.GenerationConfig(
                         temperature=0.3,
                         max_output_tokens=4096,
                     )
                 )
 
-                result = response.text.strip()
+                # response.text tüm parçaları yeniden birleştirir ve
+                # engellenmiş cevapta anlaşılmaz hata fırlatır; aday
+                # doğrudan okunur. Güvenlik/alıntı engeli deterministik:
+                # retry aynı sonucu verir, kalan denemeler harcanmaz
+                cand = response.candidates[0]
+                if getattr(cand.finish_reason, "name", "") in ("SAFETY", "RECITATION"):
+                    return TranslationResult(
+                        text=text,
+                        source_lang=source_lang,
+                        target_lang=target_lang,
+                        success=False,
+                        error=cand.finish_reason.name
+                    )
+
+                result = "".join(p.text for p in cand.content.parts).strip()
 
                 # Cache'e ekle
-                self._cache[cache_key] = result
+                self._cache.set(key, result)
 
                 return TranslationResult(
                     text=result,
@@ -231,8 +399,26 @@ class GeminiTranslator:
                 )
 
             except Exception as e:
+                # Kalıcı hatalar (geçersiz argüman, yetki) retry ile
+                # düzelmez: kota penceresini boşa harcamadan hemen dön
+                if type(e).__name__ in ("InvalidArgument", "PermissionDenied"):
+                    return TranslationResult(
+                        text=text,
+                        source_lang=source_lang,
+                        target_lang=target_lang,
+                        success=False,
+                        error=str(e)
+                    )
+
                 if attempt < AI_MAX_RETRIES - 1:
-                    time.sleep(1)  # Retry önce bekle
+                    # Üstel backoff + jitter: 429/503 fırtınasında tüm
+                    # denemelerin aynı anda geri gelmesini engeller.
+                    # Sunucu bekleme süresi önerdiyse ona uyulur
+                    delay = min(30, (2 ** attempt) * 0.5) + random.uniform(0, 0.25)
+                    retry_delay = getattr(e, "retry_delay", None)
+                    if retry_delay is not None:
+                        delay = max(delay, getattr(retry_delay, "seconds", 0))
+                    time.sleep(delay)
                     continue
                 else:
                     return TranslationResult(
@@ -256,22 +442,128 @@ class GeminiTranslator:
         Returns:
             List[TranslationResult]: Çeviri sonuçları
         """
-        results = []
+        if not texts:
+            return []
+
+        # Tekrarlı bloklar bir kez çevrilir. Benzersiz metinler
+        # AI_BATCH_SIZE'lık gruplar halinde tek prompt'ta gönderilir:
+        # sistem talimatı token'ları grup başına bir kez ödenir. Ayraç
+        # kaybolursa grup metin başına thread'li yola düşer
+        unique_texts = list(dict.fromkeys(texts))
+        unique_results: List[TranslationResult] = []
+
+        for start in range(0, len(unique_texts), AI_BATCH_SIZE):
+            chunk = unique_texts[start:start + AI_BATCH_SIZE]
+            try:
+                unique_results.extend(
+                    self._translate_prompt_chunk(chunk, target_lang, source_lang)
+                )
+            except Exception as e:
+                logger.warning("Toplu prompt başarısız, tek tek çevriliyor: %s", e)
+                unique_results.extend(
+                    self._translate_batch_threaded(chunk, target_lang, source_lang)
+                )
+
+        by_text = dict(zip(unique_texts, unique_results))
+        return [by_text[text] for text in texts]
+
+    def _translate_batch_threaded(self, texts: List[str], target_lang: str,
+                                  source_lang: str) -> List[TranslationResult]:
+        """Metin başına istekleri thread havuzunda örtüştür"""
+        workers = min(len(texts), self.batch_workers)
+        results: List[Optional[TranslationResult]] = [None] * len(texts)
 
-        for i, text in enumerate(texts):
-            # Progress
-            if i % AI_BATCH_SIZE == 0:
-                print(f"📝 Çeviri: {i}/{len(texts)}")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._translate_limited, text, target_lang, source_lang): i
+                for i, text in enumerate(texts)
+            }
 
-            result = self.translate(text, target_lang, source_lang)
-            results.append(result)
+            done = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                if done % AI_BATCH_SIZE == 0:
+                    logger.debug("Çeviri: %d/%d", done, len(texts))
 
-            # Rate limiting için kısa bekleme
-            if i > 0 and i % AI_BATCH_SIZE == 0:
-                time.sleep(0.5)
+        return results
+
+    _BATCH_SPLIT_RE = re.compile(r"<<<\d+>>>\s*")
+
+    def _translate_prompt_chunk(self, chunk: List[str], target_lang: str,
+                                source_lang: str) -> List[TranslationResult]:
+        """Bir grubu tek Gemini prompt'unda çevir (cache'tekiler gönderilmez)"""
+        # Blake2b anahtarı metin başına bir kez hesaplanır; filtre,
+        # yazma ve okuma aynı anahtarı paylaşır
+        keys = {text: cache_key(source_lang, target_lang, text) for text in chunk}
+
+        to_send = [
+            text for text in chunk
+            if text.strip() and not _is_passthrough(text)
+            and self._cache.get(keys[text]) is None
+        ]
+
+        if to_send:
+            target_name = LANGUAGE_NAMES.get(target_lang, target_lang)
+            numbered = "\n".join(
+                f"<<<{i + 1}>>>\n{text}" for i, text in enumerate(to_send)
+            )
+
+            prompt = f"""Sen profesyonel bir çevirmensin. Aşağıdaki numaralı metinleri {target_name}'ye çevir.
+
+Kurallar:
+1. Sadece çevrilmiş metinleri döndür, açıklama yapma
+2. <<<N>>> ayraçlarını aynen koru, sırayı değiştirme
+3. Satır sonlarını ve paragraf yapısını koru
+4. Özel isimleri, tarihleri, sayıları koru
+5. Türkçe karakterleri (ç, ğ, ı, ö, ş, ü) koru
+
+Metinler:
+{numbered}"""
+
+            self._bucket.acquire()
+            response = self.model.generate_content(
+                prompt,
+                generation_config=self._genai.types.GenerationConfig(
+                    temperature=0.3,
+                    max_output_tokens=8192,
+                )
+            )
+
+            pieces = self._BATCH_SPLIT_RE.split(response.text)[1:]
+            if len(pieces) != len(to_send):
+                raise ValueError("ayraç sayısı girişle uyuşmuyor")
+
+            for text, piece in zip(to_send, pieces):
+                self._cache.set(keys[text], piece.strip())
+
+        results = []
+        for text in chunk:
+            if not text.strip() or _is_passthrough(text):
+                results.append(TranslationResult(
+                    text=text,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    success=True
+                ))
+                continue
+
+            translated = self._cache.get(keys[text])
+            results.append(TranslationResult(
+                text=translated if translated is not None else text,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                success=translated is not None
+            ))
 
         return results
 
+    def _translate_limited(self, text: str, target_lang: str,
+                           source_lang: str) -> TranslationResult:
+        """Token alıp çevir (batch işçileri için)"""
+        self._bucket.acquire()
+        return self.translate(text, target_lang, source_lang)
+
     def translate_blocks(self, blocks: List[Dict], target_lang: str = "tr",
                         source_lang: str = "auto") -> List[str]:
         """
@@ -288,7 +580,7 @@ class GeminiTranslator:
         texts = [block.get("text", "") for block in blocks]
         results = self.translate_batch(texts, target_lang, source_lang)
 
-        return [r.text if r.success else texts[i] for i, r in enumerate(results)]
+        return [r.text if r.success else t for t, r in zip(texts, results)]
 
     def clear_cache(self):
         """Çeviri cache'ini temizle"""
@@ -301,6 +593,7 @@ class GeminiTranslator:
 
 # Singleton instance
 _translator_instance = None
+_translator_lock = threading.Lock()
 
 
 def get_translator():
@@ -318,19 +611,23 @@ def get_translator():
     HF Token Priority: WRITE -> READ -> API_KEY
     """
     global _translator_instance
-    
+
     if _translator_instance is None:
-        # Multi-Provider Translator kullan - Failover destekli
-        print("🌐 Multi-Provider Translator yükleniyor...")
-        try:
-            from translators.multi_translator import get_translator as get_multi
-            _translator_instance = get_multi()
-        except ImportError:
-            # Fallback: HF Translator
-            print("⚠️ Multi-translator yüklenemedi, HF Translator kullanılıyor")
-            from translators.hf_translator import get_translator as get_hf
-            _translator_instance = get_hf()
-    
+        # Eş zamanlı ilk istekler iki translator kurmasın diye
+        # double-checked locking: kilit yalnızca ilk kurulumda alınır
+        with _translator_lock:
+            if _translator_instance is None:
+                # Multi-Provider Translator kullan - Failover destekli
+                logger.info("Multi-Provider Translator yükleniyor...")
+                try:
+                    from translators.multi_translator import get_translator as get_multi
+                    _translator_instance = get_multi()
+                except ImportError:
+                    # Fallback: HF Translator
+                    logger.warning("Multi-translator yüklenemedi, HF Translator kullanılıyor")
+                    from translators.hf_translator import get_translator as get_hf
+                    _translator_instance = get_hf()
+
     return _translator_instance
 
 
@@ -7,12 +7,24 @@ Token Priority: WRITE -> READ -> API_KEY
 Models: Helsinki-NLP/opus-mt-* for fast translation
 """
 
+import functools
+import logging
 import os
+import random
+import threading
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict
 from dataclasses import dataclass
 
+from translators._http import get_shared_session, json_dumps, json_loads
+from translators.fallback_translator import (
+    TokenBucket,
+    cache_key,
+    is_passthrough,
+    make_translation_cache,
+)
+
 
 @dataclass
 class TranslationResult:
@@ -29,28 +41,22 @@ class TranslationResult:
         return self.text if self.success else f"Error: {self.error}"
 
 
-# OPUS model map - best performance
-OPUS_MODELS = {
-    ("en", "tr"): "Helsinki-NLP/opus-mt-en-tr",
-    ("tr", "en"): "Helsinki-NLP/opus-mt-tr-en",
-    ("en", "de"): "Helsinki-NLP/opus-mt-en-de",
-    ("de", "en"): "Helsinki-NLP/opus-mt-de-en",
-    ("en", "fr"): "Helsinki-NLP/opus-mt-en-fr",
-    ("fr", "en"): "Helsinki-NLP/opus-mt-fr-en",
-    ("en", "es"): "Helsinki-NLP/opus-mt-en-es",
-    ("es", "en"): "Helsinki-NLP/opus-mt-es-en",
-    ("de", "tr"): "Helsinki-NLP/opus-mt-de-tr",
-    ("tr", "de"): "Helsinki-NLP/opus-mt-tr-de",
-}
-
-# NLLB language codes
-NLLB_LANG_CODES = {
-    "en": "eng_Latn",
-    "tr": "tur_Latn",
-    "de": "deu_Latn",
-    "fr": "fra_Latn",
-    "es": "spa_Latn",
-}
+# Shared language tables (single copy for all translators)
+from translators._lang_tables import NLLB_LANG_CODES, OPUS_MODELS
+
+# Hot-path logging goes through a logger: per-text prints serialize the
+# threaded batch workers on the stdout lock. NullHandler keeps the
+# module quiet unless the application attaches a handler
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class HFAPIError(Exception):
+    """HF API error carrying the HTTP status code"""
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
 
 
 def get_hf_token() -> str:
@@ -82,14 +88,35 @@ class HFTranslatorV2:
     def __init__(self, token: str = None):
         """Initialize translator"""
         self.token = token or get_hf_token()
-        self._cache = {}
+        # Shared LRU + SQLite cache: Blake2b keys (no hash() collisions)
+        # and translations survive process restarts
+        self._cache = make_translation_cache()
         self._retry_count = 3
         self._retry_delay = 2
         
         # Custom model overrides from ENV
         self.model_en_tr = os.environ.get("HF_MODEL_EN_TR", "Helsinki-NLP/opus-mt-en-tr")
         self.model_tr_en = os.environ.get("HF_MODEL_TR_EN", "Helsinki-NLP/opus-mt-tr-en")
-        
+
+        # Dil çifti -> model tablosu: env override'lar OPUS tablosunun
+        # üstüne yazılır, seçim tek dict lookup olur
+        self._models = dict(OPUS_MODELS)
+        self._models[("en", "tr")] = self.model_en_tr
+        self._models[("tr", "en")] = self.model_tr_en
+        self._model_cache = {}
+        self._api_urls = {}
+        # Headers never change after init; build the dict once
+        self._headers = {"Content-Type": "application/json"}
+        if self.token:
+            self._headers["Authorization"] = f"Bearer {self.token}"
+        self.batch_size = int(os.environ.get("HF_BATCH_SIZE", "32"))
+        self.batch_workers = int(os.environ.get("HF_BATCH_WORKERS", "4"))
+
+        # Token bucket replaces the old fixed sleeps: requests may burst
+        # within quota and only block once the quota is spent
+        rate_per_min = float(os.environ.get("HF_RATE_PER_MIN", "60"))
+        self._bucket = TokenBucket(rate=rate_per_min / 60.0, burst=8)
+
         if self.token:
             token_preview = f"***{self.token[-4:]}" if len(self.token) > 4 else "***"
             print(f"🤗 HF Translator v2 initialized (token: {token_preview})")
@@ -97,31 +124,24 @@ class HFTranslatorV2:
             print("⚠️ NO HF TOKEN FOUND - Translation will fail!")
 
     def _get_headers(self) -> Dict:
-        """Get API headers"""
-        if not self.token:
-            return {"Content-Type": "application/json"}
-        return {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        """Get API headers (prebuilt in __init__)"""
+        return self._headers
 
     def _select_model(self, source_lang: str, target_lang: str) -> str:
-        """Select best model for language pair"""
-        src = "en" if source_lang == "auto" else source_lang
-        
-        # Check custom model overrides
-        if src == "en" and target_lang == "tr":
-            return self.model_en_tr
-        if src == "tr" and target_lang == "en":
-            return self.model_tr_en
-            
-        # Check OPUS models
-        key = (src, target_lang)
-        if key in OPUS_MODELS:
-            return OPUS_MODELS[key]
-        
-        # Fallback to NLLB
-        return "facebook/nllb-200-distilled-600M"
+        """Select best model for language pair (memoized per pair)
+
+        Called once per text; after the first lookup for a pair the
+        auto-normalization and fallback logic collapse to a single
+        dict probe on interned short strings.
+        """
+        key = (source_lang, target_lang)
+        model = self._model_cache.get(key)
+        if model is None:
+            src = "en" if source_lang == "auto" else source_lang
+            # Fallback to NLLB
+            model = self._models.get((src, target_lang), "facebook/nllb-200-distilled-600M")
+            self._model_cache[key] = model
+        return model
 
     def translate(self, text: str, target_lang: str = "tr", source_lang: str = "auto",
                  doc_type: str = None, preserve_format: bool = True) -> TranslationResult:
@@ -146,9 +166,20 @@ class HFTranslatorV2:
                 model="passthrough"
             )
 
+        # Numbers, URLs, emails, pure punctuation: nothing to translate,
+        # skip the round trip entirely
+        if is_passthrough(text):
+            return TranslationResult(
+                text=text,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                success=True,
+                model="passthrough-skip"
+            )
+
         # Token check
         if not self.token:
-            print(f"❌ NO TOKEN - Cannot translate: {text[:50]}...")
+            logger.warning("NO TOKEN - Cannot translate: %s...", text[:50])
             return TranslationResult(
                 text=text,
                 source_lang=source_lang,
@@ -159,10 +190,11 @@ class HFTranslatorV2:
             )
 
         # Cache check
-        cache_key = f"{source_lang}:{target_lang}:{hash(text)}"
-        if cache_key in self._cache:
+        key = cache_key(source_lang, target_lang, text)
+        cached = self._cache.get(key)
+        if cached is not None:
             return TranslationResult(
-                text=self._cache[cache_key],
+                text=cached,
                 source_lang=source_lang,
                 target_lang=target_lang,
                 success=True,
@@ -176,12 +208,16 @@ class HFTranslatorV2:
         for attempt in range(self._retry_count):
             try:
                 result = self._call_hf_api(text, model, source_lang, target_lang)
-                
+
                 # Cache result
-                self._cache[cache_key] = result
-                
-                print(f"✅ Translated ({model}): {text[:30]}... -> {result[:30]}...")
+                self._cache.set(key, result)
                 
+                # Slicing/formatting only happens when DEBUG is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Translated (%s): %s... -> %s...",
+                                 model, text[:30], result[:30])
+
+
                 return TranslationResult(
                     text=result,
                     source_lang=source_lang,
@@ -192,17 +228,16 @@ class HFTranslatorV2:
                 
             except Exception as e:
                 error_msg = str(e)
-                print(f"⚠️ Attempt {attempt + 1}/{self._retry_count} failed: {error_msg}")
-                
-                # Check if model is loading
-                if "loading" in error_msg.lower() or "503" in error_msg:
-                    wait_time = self._retry_delay * (attempt + 1)
-                    print(f"⏳ Model loading, waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                
-                # Other errors
-                if attempt == self._retry_count - 1:
+                logger.warning("Attempt %d/%d failed: %s",
+                               attempt + 1, self._retry_count, error_msg)
+
+                # Retry-worthiness comes from the status code, not a
+                # substring match; other 4xx errors fail immediately.
+                # Network errors (no status) are treated as transient
+                status = getattr(e, "status", None)
+                retryable = status is None or status in (429, 503)
+
+                if not retryable or attempt == self._retry_count - 1:
                     return TranslationResult(
                         text=text,
                         source_lang=source_lang,
@@ -211,8 +246,12 @@ class HFTranslatorV2:
                         error=error_msg,
                         model=model
                     )
-                
-                time.sleep(self._retry_delay)
+
+                # Jittered exponential backoff, capped at 60s
+                wait_time = min(60, self._retry_delay * (2 ** attempt) + random.uniform(0, 1))
+                if status == 503:
+                    logger.info("Model loading, waiting %.1fs...", wait_time)
+                time.sleep(wait_time)
 
         return TranslationResult(
             text=text,
@@ -223,10 +262,31 @@ class HFTranslatorV2:
             model=model
         )
 
+    @staticmethod
+    def _read_error_detail(response):
+        """Read at most 4 KB of an error body, then drop the connection
+
+        Rate-limit error pages can be 100 KB+ of HTML; buffering them
+        fully just to build an exception message wastes download time.
+        """
+        try:
+            snippet = response.raw.read(4096, decode_content=True)
+        except Exception:
+            snippet = b""
+        finally:
+            response.close()
+
+        try:
+            return json_loads(snippet)
+        except ValueError:
+            return snippet.decode("utf-8", "replace") if snippet else ""
+
     def _call_hf_api(self, text: str, model: str, source_lang: str, target_lang: str) -> str:
         """Call HF Inference API - Updated to use router.huggingface.co"""
         # YENİ ENDPOINT - api-inference artık desteklenmiyor
-        api_url = f"https://router.huggingface.co/hf-inference/models/{model}"
+        api_url = self._api_urls.setdefault(
+            model, f"https://router.huggingface.co/hf-inference/models/{model}"
+        )
         
         # NLLB requires different payload
         if "nllb" in model.lower():
@@ -241,25 +301,39 @@ class HFTranslatorV2:
             }
         else:
             payload = {"inputs": text}
-        
-        response = requests.post(
+
+        # use_cache lets HF serve identical inputs from its own cache;
+        # wait_for_model holds the connection during cold start instead
+        # of bouncing 503s into our retry loop
+        payload["options"] = {"use_cache": True, "wait_for_model": True}
+
+        self._bucket.acquire()
+        response = get_shared_session().post(
             api_url,
             headers=self._get_headers(),
-            json=payload,
-            timeout=120
+            data=json_dumps(payload),
+            timeout=120,
+            stream=True
         )
-        
-        if response.status_code == 503:
-            # Model is loading
-            data = response.json()
-            raise Exception(f"Model loading: {data.get('error', 'Unknown')}")
-        
+
         if response.status_code != 200:
-            error_data = response.json() if response.text else {}
-            raise Exception(f"API Error {response.status_code}: {error_data}")
-        
-        result = response.json()
-        
+            detail = self._read_error_detail(response)
+            if response.status_code == 503:
+                # Model is loading
+                error = detail.get("error", "Unknown") if isinstance(detail, dict) else "Unknown"
+                raise HFAPIError(f"Model loading: {error}", status=503)
+            raise HFAPIError(
+                f"API Error {response.status_code}: {detail}",
+                status=response.status_code
+            )
+
+        # Decode once; the old error branch touched .text (full decode)
+        # and then .json() (second decode) on the same body
+        try:
+            result = json_loads(response.content)
+        except ValueError:
+            result = {}
+
         if isinstance(result, list) and len(result) > 0:
             return result[0].get("translation_text", text)
         elif isinstance(result, dict):
@@ -271,36 +345,210 @@ class HFTranslatorV2:
 
     def translate_batch(self, texts: List[str], target_lang: str = "tr",
                        source_lang: str = "auto") -> List[TranslationResult]:
-        """Translate multiple texts"""
+        """Translate multiple texts with one API call per chunk
+
+        The inputs field accepts a list and returns an aligned list, so
+        the round trip is paid per chunk instead of per text. Chunks run
+        concurrently (the work is pure network I/O) while the token
+        bucket keeps the request rate within quota. A failed chunk falls
+        back to per-text translation.
+
+        Results are always aligned with the input order, regardless of
+        internal deduplication, length sorting or chunk scheduling —
+        callers may safely zip(texts, results).
+        """
+        if not texts:
+            return []
+
+        # Repeated strings (page headers, table labels, "Page N") are
+        # translated once and scattered back to every occurrence
+        unique_texts = list(dict.fromkeys(texts))
+        unique_results = self._translate_unique(unique_texts, target_lang, source_lang)
+
+        if len(unique_texts) == len(texts):
+            return unique_results
+
+        by_text = dict(zip(unique_texts, unique_results))
+        return [by_text[text] for text in texts]
+
+    def _translate_unique(self, texts: List[str], target_lang: str,
+                         source_lang: str) -> List[TranslationResult]:
+        """Translate a deduplicated list of texts in parallel chunks
+
+        Chunks are filled in length order so short labels and long
+        paragraphs land in separate batches: NMT models pad every input
+        in a batch to the longest one, so mixing wastes model compute.
+        Results are mapped back to the caller's order at the end.
+        """
+        ordered = sorted(texts, key=len)
+        chunks = [
+            ordered[start:start + self.batch_size]
+            for start in range(0, len(ordered), self.batch_size)
+        ]
+
+        if len(chunks) == 1:
+            chunk_results = [self._translate_chunk_safe(chunks[0], target_lang, source_lang)]
+        else:
+            logger.debug("Translating %d texts in %d parallel batches...",
+                         len(texts), len(chunks))
+            chunk_results = [None] * len(chunks)
+            workers = min(self.batch_workers, len(chunks))
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(self._translate_chunk_safe, chunk, target_lang, source_lang): i
+                    for i, chunk in enumerate(chunks)
+                }
+                for future in as_completed(futures):
+                    chunk_results[futures[future]] = future.result()
+
+        by_text = dict(zip(
+            ordered,
+            (result for chunk in chunk_results for result in chunk)
+        ))
+        return [by_text[text] for text in texts]
+
+    def _translate_chunk_safe(self, chunk: List[str], target_lang: str,
+                             source_lang: str) -> List[TranslationResult]:
+        """Translate one chunk, falling back to per-text calls on failure"""
+        try:
+            return self._translate_chunk(chunk, target_lang, source_lang)
+        except Exception as e:
+            logger.warning("Batch call failed, falling back to per-text: %s", e)
+            return [self.translate(text, target_lang, source_lang) for text in chunk]
+
+    def _translate_chunk(self, chunk: List[str], target_lang: str,
+                        source_lang: str) -> List[TranslationResult]:
+        """Translate one chunk with a single API request (cached texts are not sent)"""
+        model = self._select_model(source_lang, target_lang)
+        keys = {text: cache_key(source_lang, target_lang, text) for text in chunk}
+
+        to_send = [
+            text for text in chunk
+            if not is_passthrough(text) and self._cache.get(keys[text]) is None
+        ]
+
+        if to_send:
+            translated = self._call_hf_api_batch(to_send, model, source_lang, target_lang)
+            for text, result in zip(to_send, translated):
+                self._cache.set(keys[text], result)
+
         results = []
-        total = len(texts)
-        
-        for i, text in enumerate(texts):
-            print(f"📝 Translating {i + 1}/{total}...")
-            result = self.translate(text, target_lang, source_lang)
-            results.append(result)
-            
-            # Rate limiting for free tier
-            if i > 0 and i % 3 == 0:
-                time.sleep(0.5)
-        
+        for text in chunk:
+            if is_passthrough(text):
+                results.append(TranslationResult(
+                    text=text,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    success=True,
+                    model="passthrough"
+                ))
+                continue
+
+            cached = self._cache.get(keys[text])
+            results.append(TranslationResult(
+                text=cached if cached is not None else text,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                success=cached is not None,
+                model=model
+            ))
+
         return results
 
+    def _call_hf_api_batch(self, texts: List[str], model: str,
+                          source_lang: str, target_lang: str) -> List[str]:
+        """Call HF Inference API with a list payload, return aligned translations"""
+        api_url = self._api_urls.setdefault(
+            model, f"https://router.huggingface.co/hf-inference/models/{model}"
+        )
+
+        payload = {
+            "inputs": texts,
+            "options": {"use_cache": True, "wait_for_model": True},
+        }
+        if "nllb" in model.lower():
+            payload["parameters"] = {
+                "src_lang": NLLB_LANG_CODES.get(
+                    source_lang if source_lang != "auto" else "en", "eng_Latn"
+                ),
+                "tgt_lang": NLLB_LANG_CODES.get(target_lang, "tur_Latn"),
+            }
+
+        self._bucket.acquire()
+        response = get_shared_session().post(
+            api_url,
+            headers=self._get_headers(),
+            data=json_dumps(payload),
+            timeout=120,
+            stream=True
+        )
+
+        if response.status_code != 200:
+            response.close()
+            raise HFAPIError(f"API Error {response.status_code}", status=response.status_code)
+
+        data = json_loads(response.content)
+        if not isinstance(data, list) or len(data) != len(texts):
+            raise Exception("Batch response is not an aligned list")
+
+        return [
+            item.get("translation_text", text) if isinstance(item, dict) else text
+            for text, item in zip(texts, data)
+        ]
+
     def clear_cache(self):
         """Clear translation cache"""
         self._cache.clear()
 
 
-# Singleton instance
-_translator_instance = None
+# Singleton instance: functools.cache is thread-safe for the
+# first-call race, so concurrent first users share one translator
+@functools.cache
+def get_translator() -> HFTranslatorV2:
+    """Get singleton translator instance"""
+    return HFTranslatorV2()
 
 
-def get_translator():
-    """Get singleton translator instance"""
-    global _translator_instance
-    if _translator_instance is None:
-        _translator_instance = HFTranslatorV2()
-    return _translator_instance
+@functools.cache
+def _get_worker_pool() -> ThreadPoolExecutor:
+    """Long-lived pool for background translation submissions"""
+    return ThreadPoolExecutor(
+        max_workers=int(os.environ.get("HF_WORKER_THREADS", "4")),
+        thread_name_prefix="hf-translate"
+    )
+
+
+def submit(text: str, target_lang: str = "tr", source_lang: str = "auto"):
+    """Queue a translation on the background pool, return a Future
+
+    Web handlers can fire translations without blocking on TLS warmup
+    or model cold start; call .result() when the text is needed.
+    """
+    return _get_worker_pool().submit(
+        get_translator().translate, text, target_lang, source_lang
+    )
+
+
+def warm_up(background: bool = True):
+    """Pre-build the translator and warm the connection off the request path
+
+    Fires a dummy translate so the first real user after a redeploy
+    does not pay TLS negotiation plus HF model cold start (~20s).
+    """
+    def _warm():
+        try:
+            get_translator().translate("hello", "tr", "en")
+            logger.info("HF translator warmed up")
+        except Exception as e:
+            logger.warning("HF warmup failed: %s", e)
+
+    if background:
+        thread = threading.Thread(target=_warm, name="hf-warmup", daemon=True)
+        thread.start()
+        return thread
+    _warm()
+    return None
 
 
 def translate_text(text: str, target_lang: str = "tr", source_lang: str = "auto") -> str:
@@ -12,18 +12,39 @@ PROVIDER ÖNCELİK SIRASI:
 Token Priority: WRITE -> READ -> API_KEY
 """
 
+import logging
 import os
+import random
+import threading
 import time
 import json
 import requests
+from urllib.parse import quote
 from typing import Optional, List, Dict, Callable
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import urllib3
 
 # SSL warnings'ı gizle (Railway SSL certificate issues için)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Paralel çeviri işçi sayısı. İş tamamen ağ-bağımlı (I/O) olduğu ve
+# paylaşılan bağlantı havuzu 32 bağlantıya izin verdiği için 3'ten
+# yüksek bir varsayılan güvenli; gerekirse env ile kısılabilir
+_PARALLEL_WORKERS = int(os.environ.get("TRANSLATOR_PARALLEL_WORKERS", 8))
+
+# Batch destekleyen provider'lara tek istekte gönderilecek metin sayısı
+_BATCH_CHUNK = int(os.environ.get("TRANSLATOR_BATCH_SIZE", 32))
+
+# Bu sayının üstündeki listeler dilimli (huge batch) yoldan işlenir
+_HUGE_BATCH_THRESHOLD = int(os.environ.get("TRANSLATOR_HUGE_BATCH", 500))
+
+# Sıcak yol log'ları: print stdout'u her metinde bloklar, logger ise
+# seviye kapalıyken neredeyse bedava. NullHandler ile kütüphane gibi
+# sessiz kalınır, uygulama handler bağlarsa log akar
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 
 @dataclass
 class TranslationResult:
@@ -45,38 +66,17 @@ class TranslationResult:
 # DİL KODLARI VE MODEL HARİTALARI
 # ============================================================================
 
-# Helsinki-NLP OPUS modelleri - En hızlı ve güvenilir
-OPUS_MODELS = {
-    ("en", "tr"): "Helsinki-NLP/opus-mt-en-tr",
-    ("tr", "en"): "Helsinki-NLP/opus-mt-tr-en",
-    ("en", "de"): "Helsinki-NLP/opus-mt-en-de",
-    ("de", "en"): "Helsinki-NLP/opus-mt-de-en",
-    ("en", "fr"): "Helsinki-NLP/opus-mt-en-fr",
-    ("fr", "en"): "Helsinki-NLP/opus-mt-fr-en",
-    ("en", "es"): "Helsinki-NLP/opus-mt-en-es",
-    ("es", "en"): "Helsinki-NLP/opus-mt-es-en",
-    ("en", "it"): "Helsinki-NLP/opus-mt-en-it",
-    ("it", "en"): "Helsinki-NLP/opus-mt-it-en",
-    ("en", "ru"): "Helsinki-NLP/opus-mt-en-ru",
-    ("ru", "en"): "Helsinki-NLP/opus-mt-ru-en",
-    ("en", "ar"): "Helsinki-NLP/opus-mt-en-ar",
-    ("ar", "en"): "Helsinki-NLP/opus-mt-ar-en",
-    ("en", "zh"): "Helsinki-NLP/opus-mt-en-zh",
-    ("zh", "en"): "Helsinki-NLP/opus-mt-zh-en",
-    ("de", "tr"): "Helsinki-NLP/opus-mt-de-tr",
-    ("tr", "de"): "Helsinki-NLP/opus-mt-tr-de",
-    ("fr", "tr"): "Helsinki-NLP/opus-mt-fr-tr",
-    ("tr", "fr"): "Helsinki-NLP/opus-mt-tr-fr",
-}
-
-# NLLB dil kodları (Facebook modeli için)
-NLLB_LANG_CODES = {
-    "en": "eng_Latn", "tr": "tur_Latn", "de": "deu_Latn",
-    "fr": "fra_Latn", "es": "spa_Latn", "it": "ita_Latn",
-    "ru": "rus_Cyrl", "ar": "arb_Arab", "zh": "zho_Hans",
-    "ja": "jpn_Jpan", "ko": "kor_Hang", "nl": "nld_Latn",
-    "pl": "pol_Latn", "pt": "por_Latn", "sv": "swe_Latn",
-}
+# Ortak tablolar tek kopyadan gelir (bkz. _lang_tables)
+from translators._lang_tables import NLLB_LANG_CODES, OPUS_MODELS
+
+# Paylaşılan pooled Session + orjson destekli JSON yardımcıları
+from translators._http import get_shared_session, json_dumps, json_loads
+
+# Ortak cache altyapısı + passthrough tespiti + hız sınırlayıcı
+# (bkz. fallback_translator)
+from translators.fallback_translator import (
+    TokenBucket, cache_key, is_passthrough, make_translation_cache
+)
 
 
 def get_hf_token() -> str:
@@ -106,45 +106,75 @@ class HuggingFaceProvider:
         self.base_url = "https://router.huggingface.co/hf-inference/models"
         self.timeout = 120
         self.available = bool(self.token)
-        
+        # Header'lar her çağrıda değil bir kez kurulur; token oturuma
+        # değil HF isteklerine verilir (diğer hostlara sızmasın)
+        self._headers = {"Content-Type": "application/json"}
+        if self.token:
+            self._headers["Authorization"] = f"Bearer {self.token}"
+        # Sabit sleep yerine token bucket: kota içinde istekler art arda
+        # gider, kota dolunca acquire bloklar
+        self._bucket = TokenBucket(float(os.environ.get("HF_RATE", 10)), burst=10)
+
     def _get_headers(self) -> Dict:
-        return {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        } if self.token else {"Content-Type": "application/json"}
-    
+        return self._headers
+
+    # (source, target) -> (model, is_nllb, nllb_src, nllb_tgt)
+    # Model seçimi + NLLB kod çözümü her çağrıda değil bir kez yapılır;
+    # bilinen Opus çiftleri import anında doldurulur (bkz. sınıf sonrası)
+    _MODEL_CACHE = {}
+
+    @classmethod
+    def _route(cls, source_lang: str, target_lang: str) -> tuple:
+        """Dil çifti için model rotasını tek lookup'ta döndür"""
+        key = (source_lang, target_lang)
+        route = cls._MODEL_CACHE.get(key)
+        if route is None:
+            src = "en" if source_lang == "auto" else source_lang
+            model = OPUS_MODELS.get((src, target_lang), "facebook/nllb-200-distilled-600M")
+            is_nllb = "nllb" in model.lower()
+            src_code = NLLB_LANG_CODES.get(src, "eng_Latn") if is_nllb else None
+            tgt_code = NLLB_LANG_CODES.get(target_lang, "tur_Latn") if is_nllb else None
+            route = (model, is_nllb, src_code, tgt_code)
+            cls._MODEL_CACHE[key] = route
+        return route
+
     def _select_model(self, source_lang: str, target_lang: str) -> str:
-        src = "en" if source_lang == "auto" else source_lang
-        key = (src, target_lang)
-        return OPUS_MODELS.get(key, "facebook/nllb-200-distilled-600M")
-    
+        return self._route(source_lang, target_lang)[0]
+
     def translate(self, text: str, target_lang: str, source_lang: str = "auto") -> TranslationResult:
         if not self.available:
             return TranslationResult(text=text, source_lang=source_lang, target_lang=target_lang,
                                     success=False, error="No HF token", provider=self.name)
-        
-        model = self._select_model(source_lang, target_lang)
+
+        model, is_nllb, src_code, tgt_code = self._route(source_lang, target_lang)
         api_url = f"{self.base_url}/{model}"
-        
+
         # NLLB için özel payload
-        if "nllb" in model.lower():
-            src_code = NLLB_LANG_CODES.get(source_lang if source_lang != "auto" else "en", "eng_Latn")
-            tgt_code = NLLB_LANG_CODES.get(target_lang, "tur_Latn")
+        if is_nllb:
             payload = {"inputs": text, "parameters": {"src_lang": src_code, "tgt_lang": tgt_code}}
         else:
             payload = {"inputs": text}
         
         try:
-            response = requests.post(api_url, headers=self._get_headers(), json=payload, timeout=self.timeout)
+            for attempt in range(3):
+                self._bucket.acquire()
+                response = get_shared_session().post(api_url, headers=self._headers, data=json_dumps(payload), timeout=self.timeout)
+                if response.status_code == 503 and attempt < 2:
+                    # Model yükleniyor: jitter'lı artan bekleme, worker'lar
+                    # aynı anda tekrar yüklenmeye çarpmasın
+                    time.sleep(2 * (attempt + 1) + random.uniform(0, 1))
+                    continue
+                break
             response.encoding = 'utf-8' # Force UTF-8 for Turkish characters
-            
-            # Boş yanıt kontrolü
-            if not response.text or len(response.text.strip()) == 0:
+
+            # Boş yanıt kontrolü (content: gövde decode edilmeden)
+            if not response.content:
                 raise Exception("Boş API yanıtı")
-            
-            # HTML yanıt kontrolü (hata sayfası)
-            if response.text.strip().startswith("<!") or response.text.strip().startswith("<html"):
-                raise Exception("API HTML hata sayfası döndürdü")
+
+            # HTML hata sayfası vb. gövdeyi okumadan header'dan yakalanır
+            content_type = response.headers.get("Content-Type", "")
+            if "json" not in content_type:
+                raise Exception(f"Beklenmeyen içerik tipi: {content_type or 'yok'}")
             
             if response.status_code == 503:
                 try:
@@ -160,8 +190,8 @@ class HuggingFaceProvider:
                     error_data = {"raw": response.text[:200]}
                 raise Exception(f"API Hatası {response.status_code}: {error_data}")
             
-            result = response.json()
-            
+            result = json_loads(response.content)
+
             if isinstance(result, list) and len(result) > 0:
                 translated = result[0].get("translation_text", text)
             elif isinstance(result, dict):
@@ -176,7 +206,7 @@ class HuggingFaceProvider:
                 success=True, provider=self.name, model=model
             )
             
-        except requests.exceptions.JSONDecodeError as e:
+        except ValueError as e:
             return TranslationResult(
                 text=text, source_lang=source_lang, target_lang=target_lang,
                 success=False, error=f"JSON parse hatası: {response.text[:100] if response else 'N/A'}", 
@@ -188,6 +218,121 @@ class HuggingFaceProvider:
                 success=False, error=str(e), provider=self.name, model=model
             )
 
+    def translate_many(self, texts: List[str], target_lang: str,
+                      source_lang: str = "auto") -> List[TranslationResult]:
+        """Toplu çeviri - tek HTTP isteği, list inputs
+
+        HF Inference API inputs olarak liste kabul eder ve aynı sırada
+        liste döner; N metin için N istek yerine tek istek atılır.
+        Hata durumunda exception fırlatır, çağıran tek tek çeviriye düşer.
+        """
+        model, is_nllb, src_code, tgt_code = self._route(source_lang, target_lang)
+        api_url = f"{self.base_url}/{model}"
+
+        payload = {
+            "inputs": texts,
+            "options": {"use_cache": True, "wait_for_model": True}
+        }
+        if is_nllb:
+            payload["parameters"] = {"src_lang": src_code, "tgt_lang": tgt_code}
+
+        self._bucket.acquire()
+        response = get_shared_session().post(api_url, headers=self._headers, data=json_dumps(payload), timeout=self.timeout)
+        if response.status_code != 200:
+            raise Exception(f"API Hatası {response.status_code}: {response.text[:200]}")
+
+        result = json_loads(response.content)
+        if not isinstance(result, list) or len(result) != len(texts):
+            raise Exception("Batch yanıtı metin sayısıyla eşleşmiyor")
+
+        return [
+            TranslationResult(
+                text=item.get("translation_text", text),
+                source_lang=source_lang, target_lang=target_lang,
+                success=True, provider=self.name, model=model
+            )
+            for text, item in zip(texts, result)
+        ]
+
+
+# Bilinen Opus çiftlerinin rotaları import anında hazırlanır; çeviri
+# sırasında sadece dict lookup kalır
+for _pair in OPUS_MODELS:
+    HuggingFaceProvider._route(*_pair)
+del _pair
+
+
+class LocalCT2Provider:
+    """
+    Yerel CTranslate2 çevirisi - Ağ gerektirmez
+
+    CT2_MODEL_DIR int8'e dönüştürülmüş bir model dizinini gösterirse
+    çeviri tamamen yerelde koşar: istek başına RTT maliyeti sıfırlanır
+    ve gerçek CPU batch çıkarımı yapılır. ctranslate2/transformers
+    kurulu değilse provider kendini devre dışı bırakır.
+    """
+
+    name = "local-ct2"
+
+    def __init__(self, model_dir: str = None):
+        self.model_dir = model_dir or os.environ.get("CT2_MODEL_DIR", "")
+        self.available = bool(self.model_dir) and os.path.isdir(self.model_dir)
+        self._translator = None
+        self._tokenizer = None
+
+    def _load(self):
+        """Modeli ilk kullanımda yükle (int8: CPU'da ~2x fp32 hızı)"""
+        if self._translator is None:
+            import ctranslate2
+            from transformers import AutoTokenizer
+
+            self._translator = ctranslate2.Translator(
+                self.model_dir, device="cpu", compute_type="int8"
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+    def translate(self, text: str, target_lang: str, source_lang: str = "auto") -> TranslationResult:
+        return self.translate_batch([text], target_lang, source_lang)[0]
+
+    def translate_batch(self, texts: List[str], target_lang: str,
+                       source_lang: str = "auto") -> List[TranslationResult]:
+        try:
+            self._load()
+
+            tokenized = [
+                self._tokenizer.convert_ids_to_tokens(self._tokenizer.encode(text))
+                for text in texts
+            ]
+            outputs = self._translator.translate_batch(
+                tokenized, beam_size=1, max_batch_size=32
+            )
+
+            results = []
+            for text, output in zip(texts, outputs):
+                token_ids = self._tokenizer.convert_tokens_to_ids(output.hypotheses[0])
+                translated = self._tokenizer.decode(token_ids, skip_special_tokens=True)
+                results.append(TranslationResult(
+                    text=translated, source_lang=source_lang, target_lang=target_lang,
+                    success=True, provider=self.name, model=self.model_dir
+                ))
+            return results
+
+        except ImportError as e:
+            # ctranslate2/transformers kurulu değil: bir daha denenmesin
+            self.available = False
+            return [TranslationResult(
+                text=text, source_lang=source_lang, target_lang=target_lang,
+                success=False, error=f"CT2 kurulu değil: {e}", provider=self.name
+            ) for text in texts]
+        except Exception as e:
+            return [TranslationResult(
+                text=text, source_lang=source_lang, target_lang=target_lang,
+                success=False, error=str(e), provider=self.name
+            ) for text in texts]
+
+    # Batch arayüz adı diğer provider'larla aynı olsun
+    translate_many = translate_batch
+
 
 class MyMemoryProvider:
     """
@@ -203,6 +348,8 @@ class MyMemoryProvider:
         self.base_url = "https://api.mymemory.translated.net/get"
         self.timeout = 3  # 3 saniye - ultra hızlı
         self.available = True
+        # Anonim kota dar: saniyede ~5 istek, kısa burst'e izin var
+        self._bucket = TokenBucket(float(os.environ.get("MYMEMORY_RATE", 5)), burst=5)
 
     def translate(self, text: str, target_lang: str, source_lang: str = "auto") -> TranslationResult:
         src = "en" if source_lang == "auto" else source_lang
@@ -212,32 +359,46 @@ class MyMemoryProvider:
         if self.email:
             params["de"] = self.email
 
-        try:
-            # Ultra hızlı request - timeout 3s
-            response = requests.get(self.base_url, params=params, timeout=self.timeout, verify=False)
+        session = get_shared_session()
+        # İstek bir kez hazırlanır: URL + param encode + header merge
+        # retry denemeleri arasında tekrarlanmaz
+        prepared = session.prepare_request(
+            requests.Request("GET", self.base_url, params=params)
+        )
 
-            if response.status_code != 200:
-                raise Exception(f"HTTP {response.status_code}")
+        for attempt in range(2):
+            try:
+                # Ultra hızlı request - timeout 3s, pooled keep-alive oturum
+                self._bucket.acquire()
+                response = session.send(prepared, timeout=self.timeout, verify=False)
 
-            data = response.json()
+                if response.status_code != 200:
+                    raise Exception(f"HTTP {response.status_code}")
 
-            if data.get("responseStatus") != 200:
-                raise Exception(data.get("responseDetails", "Bilinmeyen hata"))
+                data = json_loads(response.content)
 
-            translated = data.get("responseData", {}).get("translatedText", text)
-            match_quality = data.get("responseData", {}).get("match", 0)
+                if data.get("responseStatus") != 200:
+                    raise Exception(data.get("responseDetails", "Bilinmeyen hata"))
 
-            return TranslationResult(
-                text=translated, source_lang=src, target_lang=target_lang,
-                success=True, provider=self.name, confidence=match_quality
-            )
+                translated = data.get("responseData", {}).get("translatedText", text)
+                match_quality = data.get("responseData", {}).get("match", 0)
 
-        except Exception:
-            # Hata durumunda orijinal metni dön - timeout olmasın
-            return TranslationResult(
-                text=text, source_lang=source_lang, target_lang=target_lang,
-                success=True, provider=self.name + "-fallback", confidence=0
-            )
+                return TranslationResult(
+                    text=translated, source_lang=src, target_lang=target_lang,
+                    success=True, provider=self.name, confidence=match_quality
+                )
+
+            except Exception:
+                if attempt == 0:
+                    # Jitter'lı kısa bekleme: paralel worker'lar aynı anda
+                    # tekrar deneyip kotayı birlikte zorlamasın
+                    time.sleep(0.5 + random.uniform(0, 0.5))
+
+        # Hata durumunda orijinal metni dön - timeout olmasın
+        return TranslationResult(
+            text=text, source_lang=source_lang, target_lang=target_lang,
+            success=True, provider=self.name + "-fallback", confidence=0
+        )
 
 
 class LingvaProvider:
@@ -258,34 +419,59 @@ class LingvaProvider:
         ]
         self.timeout = 10  # 30'dan 10'a düşürüldü
         self.available = True
-        
+        # Devre kesici: başarısız instance _cooldown süresince atlanır,
+        # başarılı instance listenin başına alınır. Ölü instance'a her
+        # metinde 10 sn'lik timeout ödemek batch'i dakikalara şişiriyordu
+        self._down_until = {}
+        self._cooldown = float(os.environ.get("LINGVA_COOLDOWN", 60))
+        self._lock = threading.Lock()
+
+    def _mark_down(self, instance: str):
+        """Instance'ı cooldown süresince devre dışı bırak"""
+        with self._lock:
+            self._down_until[instance] = time.monotonic() + self._cooldown
+
+    def _mark_up(self, instance: str):
+        """Instance'ı temizle ve sonraki çağrılar için öne al"""
+        with self._lock:
+            self._down_until.pop(instance, None)
+            if self.instances[0] != instance:
+                self.instances.remove(instance)
+                self.instances.insert(0, instance)
+
     def translate(self, text: str, target_lang: str, source_lang: str = "auto") -> TranslationResult:
         src = "en" if source_lang == "auto" else source_lang
-        
-        for instance in self.instances:
+        now = time.monotonic()
+
+        for instance in list(self.instances):
             if not instance:
                 continue
-                
+            if self._down_until.get(instance, 0) > now:
+                continue  # Yakın zamanda başarısız oldu, atla
+
             try:
                 # URL encode text
-                import urllib.parse
-                encoded_text = urllib.parse.quote(text)
+                encoded_text = quote(text)
                 url = f"{instance}/api/v1/{src}/{target_lang}/{encoded_text}"
-                
-                response = requests.get(url, timeout=self.timeout)
-                
+
+                response = get_shared_session().get(url, timeout=self.timeout)
+
                 if response.status_code == 200:
-                    data = response.json()
+                    data = json_loads(response.content)
                     translated = data.get("translation", text)
-                    
+
+                    self._mark_up(instance)
                     return TranslationResult(
                         text=translated, source_lang=src, target_lang=target_lang,
                         success=True, provider=f"{self.name}:{instance}"
                     )
-                    
+
+                self._mark_down(instance)
+
             except Exception as e:
+                self._mark_down(instance)
                 continue  # Sonraki instance'ı dene
-        
+
         return TranslationResult(
             text=text, source_lang=source_lang, target_lang=target_lang,
             success=False, error="Tüm Lingva instance'ları başarısız", provider=self.name
@@ -321,14 +507,19 @@ class LibreTranslateProvider:
             payload["api_key"] = self.api_key
         
         try:
-            response = requests.post(f"{self.url}/translate", json=payload, timeout=self.timeout)
-            
+            response = get_shared_session().post(
+                f"{self.url}/translate",
+                headers={"Content-Type": "application/json"},
+                data=json_dumps(payload),
+                timeout=self.timeout
+            )
+
             if response.status_code != 200:
                 raise Exception(f"HTTP {response.status_code}")
-            
-            data = response.json()
+
+            data = json_loads(response.content)
             translated = data.get("translatedText", text)
-            
+
             return TranslationResult(
                 text=translated, source_lang=source_lang, target_lang=target_lang,
                 success=True, provider=self.name
@@ -340,6 +531,42 @@ class LibreTranslateProvider:
                 success=False, error=str(e), provider=self.name
             )
 
+    def translate_many(self, texts: List[str], target_lang: str,
+                      source_lang: str = "auto") -> List[TranslationResult]:
+        """Toplu çeviri - LibreTranslate q parametresini liste kabul eder
+
+        Hata durumunda exception fırlatır, çağıran tek tek çeviriye düşer.
+        """
+        payload = {
+            "q": texts,
+            "source": source_lang if source_lang != "auto" else "auto",
+            "target": target_lang,
+            "format": "text"
+        }
+        if self.api_key:
+            payload["api_key"] = self.api_key
+
+        response = get_shared_session().post(
+            f"{self.url}/translate",
+            headers={"Content-Type": "application/json"},
+            data=json_dumps(payload),
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}")
+
+        translated = json_loads(response.content).get("translatedText", [])
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise Exception("Batch yanıtı metin sayısıyla eşleşmiyor")
+
+        return [
+            TranslationResult(
+                text=item, source_lang=source_lang, target_lang=target_lang,
+                success=True, provider=self.name
+            )
+            for item in translated
+        ]
+
 # ============================================================================
 # ANA TRANSLATOR SINIFI
 # ============================================================================
@@ -366,8 +593,16 @@ class MultiProviderTranslator:
                 - cache_enabled: Cache aktif mi
         """
         self.config = config or {}
-        self._cache = {}
+        # Sınırsız dict yerine ortak cache: bellekte LRU, altında süreçler
+        # arası paylaşılan disk katmanı (bkz. fallback_translator)
+        self._cache = make_translation_cache()
         self._cache_enabled = self.config.get("cache_enabled", True)
+        # Paralel işçi sayısı config'ten gelirse env varsayılanını ezer
+        self.max_workers = int(self.config.get("max_workers", _PARALLEL_WORKERS))
+        # Uçuş birleştirme: aynı metni aynı anda isteyen thread'ler tek
+        # HTTP isteğini paylaşır (key -> Future)
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
         
         # Provider'ları başlat
         self.providers = self._init_providers()
@@ -379,15 +614,21 @@ class MultiProviderTranslator:
     
     def _init_providers(self) -> List:
         """Provider'ları öncelik sırasına göre başlat"""
-        provider_order = self.config.get("providers", [
-            "mymemory", "huggingface", "lingva", "libretranslate"
-        ])
-        
+        default_order = ["mymemory", "huggingface", "lingva", "libretranslate"]
+
+        # Yerel CT2 modeli varsa (veya HF_OFFLINE=1 istenmişse) ağ
+        # sağlayıcılarının önüne geçer; HF yine fallback olarak kalır
+        if os.environ.get("CT2_MODEL_DIR") or os.environ.get("HF_OFFLINE") == "1":
+            default_order.insert(0, "local-ct2")
+
+        provider_order = self.config.get("providers", default_order)
+
         provider_map = {
             "huggingface": HuggingFaceProvider,
             "mymemory": MyMemoryProvider,
             "lingva": LingvaProvider,
             "libretranslate": LibreTranslateProvider,
+            "local-ct2": LocalCT2Provider,
         }
         
         providers = []
@@ -401,6 +642,15 @@ class MultiProviderTranslator:
         
         return providers
     
+    @staticmethod
+    def _key(source_lang: str, target_lang: str, text: str) -> tuple:
+        """Cache anahtarı üret
+
+        Whitespace normalize edilir: PDF'ten gelen aynı cümle satır
+        kırılması/çift boşluk farkıyla ayrı anahtara düşmesin.
+        """
+        return cache_key(source_lang, target_lang, " ".join(text.split()))
+
     def translate(self, text: str, target_lang: str = "tr", source_lang: str = "auto",
                  doc_type: str = None, preserve_format: bool = True) -> TranslationResult:
         """
@@ -414,23 +664,52 @@ class MultiProviderTranslator:
         Returns:
             TranslationResult
         """
-        # Boş metin kontrolü
-        if not text or not text.strip():
+        # Boş metin, aynı dil veya çeviri gerektirmeyen içerik (sayı,
+        # URL, noktalama vb.) provider'a hiç gitmez
+        if (not text or not text.strip()
+                or source_lang == target_lang or is_passthrough(text)):
             return TranslationResult(
                 text=text, source_lang=source_lang, target_lang=target_lang,
                 success=True, provider="passthrough"
             )
-        
+
         # Cache kontrolü
+        key = self._key(source_lang, target_lang, text)
         if self._cache_enabled:
-            cache_key = f"{source_lang}:{target_lang}:{hash(text)}"
-            if cache_key in self._cache:
-                cached = self._cache[cache_key]
+            cached = self._cache.get(key)
+            if cached is not None:
                 return TranslationResult(
                     text=cached, source_lang=source_lang, target_lang=target_lang,
                     success=True, provider="cache"
                 )
-        
+
+        # Uçuş birleştirme: aynı anahtar zaten çevriliyorsa yeni istek
+        # açmak yerine onun sonucunu bekle (paralel yolda aynı başlık /
+        # altbilgi her worker'a düşebiliyor)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            waiting = future is not None
+            if not waiting:
+                future = Future()
+                self._inflight[key] = future
+
+        if waiting:
+            return future.result()
+
+        try:
+            result = self._translate_providers(text, target_lang, source_lang, key)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _translate_providers(self, text: str, target_lang: str, source_lang: str,
+                            key: tuple) -> TranslationResult:
+        """Provider zincirini dene; ilk başarılı sonucu cache'le ve dön"""
         # Provider'ları sırayla dene
         last_error = None
         for provider in self.providers:
@@ -443,21 +722,24 @@ class MultiProviderTranslator:
                 if result.success:
                     # Cache'e ekle
                     if self._cache_enabled:
-                        self._cache[cache_key] = result.text
-                    
-                    print(f"✅ Çeviri ({result.provider}): {text[:30]}... → {result.text[:30]}...")
+                        self._cache.set(key, result.text)
+
+                    # Dilimleme ve formatlama sadece DEBUG açıkken yapılır
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Çeviri (%s): %s... → %s...",
+                                     result.provider, text[:30], result.text[:30])
                     return result
                 else:
                     last_error = result.error
-                    print(f"⚠️ {provider.name} başarısız: {result.error}")
-                    
+                    logger.warning("%s başarısız: %s", provider.name, result.error)
+
             except Exception as e:
                 last_error = str(e)
-                print(f"⚠️ {provider.name} hata: {e}")
+                logger.warning("%s hata: %s", provider.name, e)
                 continue
-        
+
         # Tüm provider'lar başarısız
-        print(f"❌ Tüm provider'lar başarısız oldu: {text[:50]}...")
+        logger.error("Tüm provider'lar başarısız oldu: %s...", text[:50])
         return TranslationResult(
             text=text, source_lang=source_lang, target_lang=target_lang,
             success=False, error=f"Tüm provider'lar başarısız: {last_error}",
@@ -478,31 +760,125 @@ class MultiProviderTranslator:
         Returns:
             List[TranslationResult]
         """
+        # Çok büyük listeler dilimli yoldan geçer (bellek + ilerleme)
+        if len(texts) > _HUGE_BATCH_THRESHOLD:
+            return self.translate_huge_batch(texts, target_lang, source_lang)
+
         if parallel and len(texts) > 1:
             return self._translate_parallel(texts, target_lang, source_lang)
-        
+
+        # Batch endpoint'i olan ilk uygun provider tek istekte N metin
+        # çevirir; batch desteği olmayanlar için tek tek yola düşülür
+        if len(texts) > 1:
+            batch_provider = next(
+                (p for p in self.providers
+                 if p.available and hasattr(p, "translate_many")),
+                None
+            )
+            if batch_provider is not None:
+                return self._translate_batched(
+                    batch_provider, texts, target_lang, source_lang
+                )
+
         results = []
         total = len(texts)
         
         for i, text in enumerate(texts):
             if i % 10 == 0:
-                print(f"📝 Çeviri: {i}/{total}")
+                logger.debug("Çeviri ilerleme: %d/%d", i, total)
             
+            # Hız sınırı provider'ların kendi token bucket'larında;
+            # burada sabit sleep yok
             result = self.translate(text, target_lang, source_lang)
             results.append(result)
-            
-            # Rate limiting
-            if i > 0 and i % 5 == 0:
-                time.sleep(0.3)
-        
+
         return results
     
+    def translate_huge_batch(self, texts: List[str], target_lang: str = "tr",
+                            source_lang: str = "auto",
+                            section_size: int = 200) -> List[TranslationResult]:
+        """Çok büyük listeler için dilimli çeviri
+
+        Liste section_size'lık dilimlere bölünür, her dilim normal
+        translate_batch yolundan (dedupe + cache + batch endpoint)
+        geçer; ilerleme dilim başına loglanır. İş ağ-bağımlı olduğu için
+        süreç havuzu kullanılmaz: ayrı süreçler cache'i ve bağlantı
+        havuzunu paylaşamaz, pickle maliyeti de eklenir.
+        """
+        results = []
+        total = len(texts)
+        for start in range(0, total, section_size):
+            section = texts[start:start + section_size]
+            results.extend(self.translate_batch(section, target_lang, source_lang))
+            logger.info("Büyük batch: %d/%d", min(start + section_size, total), total)
+        return results
+
+    def _translate_batched(self, provider, texts: List[str], target_lang: str,
+                          source_lang: str) -> List[TranslationResult]:
+        """Batch destekli provider üzerinden parça parça çevir
+
+        Tekrarlı metinler bir kez çevrilir, cache'te olanlar hiç
+        gönderilmez. Kalanlar _BATCH_CHUNK boyutunda parçalara bölünür;
+        parça veya tekil sonuç başarısız olursa ilgili metinler normal
+        failover zincirinden (translate) tek tek geçirilir.
+        """
+        by_text = {}
+
+        to_send = []
+        for text in dict.fromkeys(texts):
+            # Passthrough metinler batch'i hiç şişirmez
+            if source_lang == target_lang or is_passthrough(text):
+                by_text[text] = TranslationResult(
+                    text=text, source_lang=source_lang, target_lang=target_lang,
+                    success=True, provider="passthrough"
+                )
+                continue
+            cached = None
+            if self._cache_enabled:
+                cached = self._cache.get(self._key(source_lang, target_lang, text))
+            if cached is not None:
+                by_text[text] = TranslationResult(
+                    text=cached, source_lang=source_lang, target_lang=target_lang,
+                    success=True, provider="cache"
+                )
+            else:
+                to_send.append(text)
+
+        for start in range(0, len(to_send), _BATCH_CHUNK):
+            chunk = to_send[start:start + _BATCH_CHUNK]
+
+            try:
+                chunk_results = provider.translate_many(chunk, target_lang, source_lang)
+            except Exception as e:
+                logger.warning("%s batch hata: %s", provider.name, e)
+                chunk_results = None
+
+            if chunk_results is None or len(chunk_results) != len(chunk):
+                for text in chunk:
+                    by_text[text] = self.translate(text, target_lang, source_lang)
+                continue
+
+            for text, result in zip(chunk, chunk_results):
+                if not result.success:
+                    result = self.translate(text, target_lang, source_lang)
+                elif self._cache_enabled:
+                    self._cache.set(self._key(source_lang, target_lang, text), result.text)
+                by_text[text] = result
+
+        return [by_text[text] for text in texts]
+
     def _translate_parallel(self, texts: List[str], target_lang: str,
-                           source_lang: str, max_workers: int = 3) -> List[TranslationResult]:
-        """Paralel çeviri"""
+                           source_lang: str, max_workers: int = None) -> List[TranslationResult]:
+        """Paralel çeviri
+
+        İşçi sayısı verilmezse config/TRANSLATOR_PARALLEL_WORKERS
+        kullanılır; metinden az işçi açmanın anlamı olmadığı için
+        listeye kırpılır.
+        """
+        workers = min(max_workers or self.max_workers, len(texts))
         results = [None] * len(texts)
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             future_to_idx = {
                 executor.submit(self.translate, text, target_lang, source_lang): i
                 for i, text in enumerate(texts)